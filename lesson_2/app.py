@@ -10,7 +10,7 @@ from private_data import private_key1, private_key2, private_key3, proxy
 
 
 async def main():
-    client = Client(private_key=private_key1, network=Networks.Optimism, proxy=proxy)
+    client = await Client.create(private_key=private_key1, network=Networks.Optimism, proxy=proxy)
     # print(await client.wallet.balance(token_address='0xaf88d065e77c8cc2239327c5edb3a432268e5831'))
     balance = await client.wallet.balance()
     balance = await client.wallet.balance()
@@ -0,0 +1,252 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import timeit
+from decimal import Decimal
+from typing import Callable, Dict, Optional, Tuple, Union
+
+from web3 import Web3
+
+from sdk.client import Client
+from sdk.data.models import DefaultABIs, Ether, GWei, Network, TokenAmount, Wei
+
+
+BASELINES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines.json')
+TOKEN = '0xaf88d065e77c8cc2239327c5edb3a432268e5831'
+WOOFI_ROUTER = '0x9aed3a8896a85fe9a8cac52c9b402d092b629a30'
+WOOFI_SWAP_ABI = [{
+    'inputs': [
+        {'name': 'fromToken', 'type': 'address'},
+        {'name': 'toToken', 'type': 'address'},
+        {'name': 'fromAmount', 'type': 'uint256'},
+        {'name': 'minToAmount', 'type': 'uint256'},
+        {'name': 'to', 'type': 'address'},
+        {'name': 'rebateTo', 'type': 'address'}
+    ],
+    'name': 'swap',
+    'outputs': [{'name': 'realToAmount', 'type': 'uint256'}],
+    'stateMutability': 'payable',
+    'type': 'function'
+}]
+
+LEGACY = '.legacy'
+
+benchmarks: Dict[str, Tuple[Callable[[], Callable], int]] = {}
+
+
+class LegacyTokenAmount:
+    __slots__ = ('Wei', 'decimals', '_ether')
+
+    def __init__(self, amount: Union[int, float, str, Decimal], decimals: int = 18, wei: bool = False) -> None:
+        if wei:
+            self.Wei: int = amount
+            self._ether: Optional[Decimal] = None
+
+        else:
+            self._ether = Decimal(str(amount))
+            self.Wei: int = int(self._ether * 10 ** decimals)
+
+        self.decimals = decimals
+
+    @property
+    def Ether(self) -> Decimal:
+        if self._ether is None:
+            self._ether = Decimal(str(self.Wei)) / 10 ** self.decimals
+        return self._ether
+
+
+def benchmark(name: str, number: int = 20_000):
+    def decorator(setup: Callable[[], Callable]):
+        benchmarks[name] = (setup, number)
+        return setup
+
+    return decorator
+
+
+def client() -> Client:
+    network = Network(name='benchmark', rpc='http://127.0.0.1:8545/', chain_id=42161, coin_symbol='ETH')
+    return Client(network=network)
+
+
+@benchmark('unit.wei')
+def unit_wei() -> Callable:
+    return lambda: Wei(10 ** 18)
+
+
+@benchmark('unit.ether_float', number=5_000)
+def unit_ether_float() -> Callable:
+    return lambda: Ether(1.5)
+
+
+@benchmark('unit.add')
+def unit_add() -> Callable:
+    a, b = Wei(10 ** 18), Wei(5 * 10 ** 17)
+    return lambda: a + b
+
+
+@benchmark('unit.add_float', number=2_000)
+def unit_add_float() -> Callable:
+    a = GWei(3)
+    return lambda: a + 0.5
+
+
+@benchmark('unit.compare')
+def unit_compare() -> Callable:
+    a, b = Wei(10 ** 18), Ether(1)
+    return lambda: a >= b
+
+
+@benchmark('unit.denomination', number=5_000)
+def unit_denomination() -> Callable:
+    return lambda: Wei(10 ** 18).GWei
+
+
+@benchmark('token_amount.ether')
+def token_amount_ether() -> Callable:
+    amount = Decimal('1.5')
+    return lambda: TokenAmount(amount=amount, decimals=6)
+
+
+@benchmark('token_amount.wei')
+def token_amount_wei() -> Callable:
+    return lambda: TokenAmount(amount=1_500_000, decimals=6, wei=True)
+
+
+@benchmark('token_amount.from_wei')
+def token_amount_from_wei() -> Callable:
+    return lambda: TokenAmount.from_wei(1_500_000, 6)
+
+
+@benchmark('token_amount.from_wei' + LEGACY)
+def token_amount_from_wei_legacy() -> Callable:
+    return lambda: LegacyTokenAmount(1_500_000, 6, wei=True)
+
+
+@benchmark('token_amount.from_units')
+def token_amount_from_units() -> Callable:
+    return lambda: TokenAmount.from_units(15, 6)
+
+
+@benchmark('token_amount.from_units' + LEGACY)
+def token_amount_from_units_legacy() -> Callable:
+    return lambda: LegacyTokenAmount(15, 6)
+
+
+@benchmark('token_amount.min_amount')
+def token_amount_min_amount() -> Callable:
+    amount = TokenAmount.from_wei(123_456_789_012, 6)
+    return lambda: amount.min_amount(slippage_bps=50)
+
+
+@benchmark('token_amount.min_amount' + LEGACY)
+def token_amount_min_amount_legacy() -> Callable:
+    amount = LegacyTokenAmount(123_456_789_012, 6, wei=True)
+    return lambda: LegacyTokenAmount(amount=float(amount.Ether) * (1 - 0.5 / 100), decimals=6)
+
+
+@benchmark('web3.to_checksum_address', number=2_000)
+def to_checksum_address() -> Callable:
+    return lambda: Web3.to_checksum_address(TOKEN)
+
+
+@benchmark('contract.encode_swap', number=200)
+def encode_swap() -> Callable:
+    contract = client().w3.eth.contract(address=Web3.to_checksum_address(WOOFI_ROUTER), abi=WOOFI_SWAP_ABI)
+    token, router = Web3.to_checksum_address(TOKEN), Web3.to_checksum_address(WOOFI_ROUTER)
+    return lambda: contract.encodeABI('swap', args=(token, token, 10 ** 6, 10 ** 15, router, router))
+
+
+@benchmark('contracts.default_token')
+def default_token() -> Callable:
+    contracts = client().contracts
+    token = Web3.to_checksum_address(TOKEN)
+
+    async def op():
+        return await contracts.default_token(contract_address=token)
+
+    return op
+
+
+@benchmark('contracts.default_token' + LEGACY, number=200)
+def default_token_legacy() -> Callable:
+    w3 = client().w3
+    token = Web3.to_checksum_address(TOKEN)
+    return lambda: w3.eth.contract(address=token, abi=DefaultABIs.Token)
+
+
+def measure(setup: Callable[[], Callable], number: int, repeat: int) -> float:
+    op = setup()
+    if asyncio.iscoroutinefunction(op):
+        async def run() -> float:
+            await op()
+            started_at = time.perf_counter()
+            for _ in range(number):
+                await op()
+            return time.perf_counter() - started_at
+
+        timings = [asyncio.run(run()) for _ in range(repeat)]
+    else:
+        timings = timeit.Timer(op).repeat(repeat=repeat, number=number)
+    return min(timings) / number * 1e6
+
+
+def load_baselines() -> Dict[str, float]:
+    if not os.path.exists(BASELINES):
+        return {}
+    with open(BASELINES) as file:
+        return json.load(file)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Offline microbenchmarks for SDK hot paths')
+    parser.add_argument('-k', '--filter', default='', help='run only benchmarks whose name contains this string')
+    parser.add_argument('-s', '--scale', type=float, default=1, help='multiplier for operations per repeat')
+    parser.add_argument('-r', '--repeat', type=int, default=7, help='repeats, the fastest is reported')
+    parser.add_argument('-t', '--threshold', type=float, default=0.3, help='allowed slowdown vs baseline')
+    parser.add_argument('--save', action='store_true', help='store the results as the new baselines')
+    args = parser.parse_args()
+
+    baselines = load_baselines()
+    results = {}
+    regressions = []
+    print(f'{"benchmark":<34} {"baseline":>12} {"current":>12} {"change":>9}')
+    for name, (setup, number) in benchmarks.items():
+        if args.filter not in name:
+            continue
+
+        number = max(int(number * args.scale), 1)
+        results[name] = current = measure(setup, number=number, repeat=args.repeat)
+        baseline = baselines.get(name)
+        if baseline is None:
+            print(f'{name:<34} {"-":>12} {current:>9.3f} us {"new":>9}')
+            continue
+
+        change = current / baseline - 1
+        status = ''
+        if change > args.threshold and not name.endswith(LEGACY):
+            status = 'REGRESSION'
+            regressions.append(name)
+        elif change < -args.threshold:
+            status = 'faster'
+        print(f'{name:<34} {baseline:>9.3f} us {current:>9.3f} us {change:>+8.1%} {status}')
+
+    for name, current in results.items():
+        if name.endswith(LEGACY) and name[:-len(LEGACY)] in results:
+            print(f'{name[:-len(LEGACY)]:<34} x{current / results[name[:-len(LEGACY)]]:.1f} vs legacy')
+
+    if args.save:
+        with open(BASELINES, 'w') as file:
+            json.dump({**baselines, **results}, file, indent=2, sort_keys=True)
+        print(f'baselines saved to {BASELINES}')
+
+    if regressions:
+        print(f'{len(regressions)} regression(s): {", ".join(regressions)}')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
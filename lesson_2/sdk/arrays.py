@@ -0,0 +1,139 @@
+import heapq
+import operator
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Union
+
+from sdk.data.models import BPS, TokenAmount, Unit
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+UINT64_MAX = 2 ** 64 - 1
+Amount = Union[int, TokenAmount, Unit]
+
+
+def descending(array) -> 'np.ndarray':
+    return len(array) - 1 - np.argsort(array[::-1], kind='stable')[::-1]
+
+
+class TokenAmountArray:
+    __slots__ = ('values', 'decimals', '_array')
+
+    def __init__(self, values: Iterable[int], decimals: int = 18) -> None:
+        self.values: List[int] = list(values)
+        self.decimals = decimals
+        self._array = None
+
+    @classmethod
+    def from_amounts(cls, amounts: Iterable[Union[TokenAmount, Unit]],
+                     decimals: Optional[int] = None) -> 'TokenAmountArray':
+        values = []
+        for amount in amounts:
+            if decimals is None:
+                decimals = amount.decimals
+            elif amount.decimals != decimals:
+                raise ArithmeticError('The values have different decimals!')
+            values.append(amount.Wei)
+        return cls(values, 18 if decimals is None else decimals)
+
+    @property
+    def array(self):
+        if self._array is None:
+            self._array = False
+            if np is not None and self.values and 0 <= min(self.values) and max(self.values) <= UINT64_MAX:
+                self._array = np.array(self.values, dtype=np.uint64)
+        return self._array if self._array is not False else None
+
+    def wei(self, other: Amount) -> int:
+        if isinstance(other, (Unit, TokenAmount)):
+            if other.decimals != self.decimals:
+                raise ArithmeticError('The values have different decimals!')
+            return other.Wei
+
+        elif isinstance(other, int):
+            return other
+
+        else:
+            raise ArithmeticError(f"{type(other)} type isn't supported!")
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __iter__(self) -> Iterator[TokenAmount]:
+        return (TokenAmount.from_wei(value, self.decimals) for value in self.values)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return TokenAmountArray(self.values[item], self.decimals)
+        return TokenAmount.from_wei(self.values[item], self.decimals)
+
+    def __str__(self):
+        return f'[{", ".join(str(amount) for amount in self)}]'
+
+    def sum(self) -> TokenAmount:
+        array = self.array
+        if array is not None and int(array.max()) * len(array) <= UINT64_MAX:
+            return TokenAmount.from_wei(int(array.sum()), self.decimals)
+        return TokenAmount.from_wei(sum(self.values), self.decimals)
+
+    def compare(self, op: Callable, other: Amount) -> List[bool]:
+        other = self.wei(other)
+        array = self.array
+        if array is not None and 0 <= other <= UINT64_MAX:
+            return op(array, np.uint64(other)).tolist()
+        return [op(value, other) for value in self.values]
+
+    def __lt__(self, other: Amount) -> List[bool]:
+        return self.compare(operator.lt, other)
+
+    def __le__(self, other: Amount) -> List[bool]:
+        return self.compare(operator.le, other)
+
+    def __gt__(self, other: Amount) -> List[bool]:
+        return self.compare(operator.gt, other)
+
+    def __ge__(self, other: Amount) -> List[bool]:
+        return self.compare(operator.ge, other)
+
+    def select(self, mask: Sequence[bool]) -> 'TokenAmountArray':
+        return TokenAmountArray([value for value, selected in zip(self.values, mask) if selected], self.decimals)
+
+    def indices(self, mask: Sequence[bool]) -> List[int]:
+        if np is not None and isinstance(mask, np.ndarray):
+            return np.flatnonzero(mask).tolist()
+        return [index for index, selected in enumerate(mask) if selected]
+
+    def scale(self, numerator: int, denominator: int = 1) -> 'TokenAmountArray':
+        if numerator < 0 or denominator <= 0:
+            raise ArithmeticError(f'Invalid scale {numerator}/{denominator}!')
+
+        array = self.array
+        if (array is not None and numerator <= UINT64_MAX and denominator <= UINT64_MAX
+                and int(array.max()) * numerator <= UINT64_MAX):
+            return TokenAmountArray((array * np.uint64(numerator) // np.uint64(denominator)).tolist(), self.decimals)
+        return TokenAmountArray([value * numerator // denominator for value in self.values], self.decimals)
+
+    def min_amount(self, slippage_bps: int) -> 'TokenAmountArray':
+        return self.scale(BPS - slippage_bps, BPS)
+
+    def argsort(self, reverse: bool = False) -> List[int]:
+        array = self.array
+        if array is not None:
+            return (descending(array) if reverse else np.argsort(array, kind='stable')).tolist()
+        return sorted(range(len(self.values)), key=self.values.__getitem__, reverse=reverse)
+
+    def sort(self, reverse: bool = False) -> 'TokenAmountArray':
+        return TokenAmountArray([self.values[index] for index in self.argsort(reverse=reverse)], self.decimals)
+
+    def top(self, k: int) -> List[int]:
+        if k <= 0:
+            return []
+        array = self.array
+        if array is not None and k < len(array):
+            kth = array[np.argpartition(array, len(array) - k)[len(array) - k]]
+            above = np.flatnonzero(array > kth)
+            indices = np.sort(np.concatenate([above, np.flatnonzero(array == kth)[:k - len(above)]]))
+            return indices[descending(array[indices])].tolist()
+        return heapq.nlargest(k, range(len(self.values)), key=self.values.__getitem__)
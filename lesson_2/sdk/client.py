@@ -1,55 +1,50 @@
-from typing import Optional
-import requests
+import asyncio
+from typing import Dict, Optional
 import random
 
 from fake_useragent import UserAgent
+from loguru import logger
 from web3 import Web3
 from web3.eth import AsyncEth
 from eth_account.signers.local import LocalAccount
 
-from sdk.exceptions import InvalidProxy
 from sdk.wallet import Wallet
 from sdk.contracts import Contracts
+from sdk.multicall import Multicall
+from sdk.providers import session_pool, batch
+from sdk.proxy_checker import proxy_checker
 from sdk.data.models import Networks, Network
 
 
 class Client:
+    user_agents: Dict[Optional[str], str] = {}
+
     network: Network
     account: Optional[LocalAccount]
     w3: Web3
 
     def __init__(self, private_key: Optional[str] = None, network: Network = Networks.Goerli,
-                 proxy: Optional[str] = None, check_proxy: bool = True) -> None:
+                 proxy: Optional[str] = None, check_proxy: bool = True, hedge: bool = False,
+                 batch_window: float = 0) -> None:
         self.network = network
         self.headers = {
             'accept': '*/*',
             'accept-language': 'en-US,en;q=0.9',
             'content-type': 'application/json',
-            'user-agent': UserAgent().chrome
+            'user-agent': Client.user_agent(proxy)
         }
         self.proxy = proxy
         if self.proxy:
-            try:
-                if 'http' not in self.proxy:
-                    self.proxy = f'http://{self.proxy}'
-
-                if check_proxy:
-                    your_ip = requests.get(
-                        'http://eth0.me/', proxies={'http': self.proxy, 'https': self.proxy}, timeout=10
-                    ).text.rstrip()
-                    if your_ip not in proxy:
-                        raise InvalidProxy(f"Proxy doesn't work! Your IP is {your_ip}.")
-
-            except InvalidProxy:
-                pass
-
-            except Exception as err:
-                raise InvalidProxy(str(err))
+            self.proxy = proxy_checker.normalize(self.proxy)
+            if check_proxy:
+                your_ip = proxy_checker.check_sync(self.proxy)
+                if your_ip not in proxy:
+                    logger.warning(f"Proxy doesn't work! Your IP is {your_ip}.")
 
         self.w3 = Web3(
-            provider=Web3.AsyncHTTPProvider(
-                endpoint_uri=self.network.rpc,
-                request_kwargs={'proxy': self.proxy, 'headers': self.headers}
+            provider=session_pool.provider(
+                endpoint_uris=self.network.rpcs, proxy=self.proxy, headers=self.headers, hedge=hedge,
+                batch_window=batch_window, rps=self.network.rps, burst=self.network.burst
             ),
             modules={'eth': (AsyncEth,)},
             middlewares=[]
@@ -64,3 +59,27 @@ class Client:
 
         self.wallet = Wallet(self)
         self.contracts = Contracts(self)
+        self.multicall = Multicall(self)
+
+    @classmethod
+    async def create(cls, private_key: Optional[str] = None, network: Network = Networks.Goerli,
+                     proxy: Optional[str] = None, check_proxy: bool = True, hedge: bool = False,
+                     batch_window: float = 0) -> 'Client':
+        if proxy and check_proxy:
+            await asyncio.gather(network.resolve(), proxy_checker.check(proxy))
+        else:
+            await network.resolve()
+        return cls(
+            private_key=private_key, network=network, proxy=proxy, check_proxy=check_proxy, hedge=hedge,
+            batch_window=batch_window
+        )
+
+    @staticmethod
+    def batch(window: float = 0.005):
+        return batch(window=window)
+
+    @staticmethod
+    def user_agent(proxy: Optional[str] = None) -> str:
+        if proxy not in Client.user_agents:
+            Client.user_agents[proxy] = UserAgent().chrome
+        return Client.user_agents[proxy]
@@ -1,12 +1,57 @@
+import json
+from collections import OrderedDict
+from copy import deepcopy
+from hashlib import sha256
+from typing import Dict, List, Tuple
+
 from eth_typing import ChecksumAddress
+from web3 import Web3
 from web3.contract import AsyncContract
 
 from sdk.data.models import DefaultABIs
 
 
+class ContractCache:
+    def __init__(self, max_size: int = 10_000) -> None:
+        self.max_size = max_size
+        self.contracts: OrderedDict[Tuple, AsyncContract] = OrderedDict()
+        self.fingerprints: Dict[int, Tuple[List, List, str]] = {}
+
+    def fingerprint(self, abi: List) -> str:
+        # the content hash is memoized per ABI object; the snapshot catches ABIs edited in place
+        cached = self.fingerprints.get(id(abi))
+        if cached and cached[0] is abi and cached[1] == abi:
+            return cached[2]
+
+        if len(self.fingerprints) >= self.max_size:
+            self.fingerprints.clear()
+        fingerprint = sha256(json.dumps(abi, sort_keys=True).encode()).hexdigest()
+        self.fingerprints[id(abi)] = (abi, deepcopy(abi), fingerprint)
+        return fingerprint
+
+    def get(self, w3: Web3, address: str, abi: List) -> AsyncContract:
+        key = (w3.provider, address.lower(), self.fingerprint(abi))
+        contract = self.contracts.get(key)
+        if contract:
+            self.contracts.move_to_end(key)
+            return contract
+
+        contract = w3.eth.contract(address=Web3.to_checksum_address(address), abi=abi)
+        self.contracts[key] = contract
+        while len(self.contracts) > self.max_size:
+            self.contracts.popitem(last=False)
+        return contract
+
+
+contract_cache = ContractCache()
+
+
 class Contracts:
     def __init__(self, client) -> None:
         self.client = client
 
+    async def get(self, contract_address: ChecksumAddress, abi: List) -> AsyncContract:
+        return contract_cache.get(w3=self.client.w3, address=contract_address, abi=abi)
+
     async def default_token(self, contract_address: ChecksumAddress) -> AsyncContract:
-        return self.client.w3.eth.contract(address=contract_address, abi=DefaultABIs.Token)
+        return await self.get(contract_address=contract_address, abi=DefaultABIs.Token)
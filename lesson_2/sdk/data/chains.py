@@ -0,0 +1,55 @@
+import json
+import os
+from typing import Dict, Optional
+
+import aiohttp
+
+from data import config
+
+
+class ChainIndex:
+    url = 'https://chainid.network/chains.json'
+    local_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'chains.json')
+    cache_path = os.path.join(config.FILES_DIR, 'chains.json')
+
+    def __init__(self) -> None:
+        self.symbols: Optional[Dict[int, str]] = None
+        self.downloaded = False
+
+    def load(self) -> Dict[int, str]:
+        if self.symbols is None:
+            self.symbols = {}
+            for path in (self.local_path, self.cache_path):
+                if os.path.exists(path):
+                    with open(path) as file:
+                        self.symbols.update({int(chain_id): symbol for chain_id, symbol in json.load(file).items()})
+        return self.symbols
+
+    def coin_symbol(self, chain_id: int) -> Optional[str]:
+        return self.load().get(chain_id)
+
+    async def download(self, timeout: float = 10) -> None:
+        if self.downloaded:
+            return
+
+        self.downloaded = True
+        async with aiohttp.ClientSession() as session:
+            async with session.get(self.url, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                chains = await response.json(content_type=None)
+
+        symbols = {network['chainId']: network['nativeCurrency']['symbol'].upper() for network in chains}
+        self.load().update(symbols)
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        with open(self.cache_path, 'w') as file:
+            json.dump(symbols, file)
+
+    async def resolve_coin_symbol(self, chain_id: int) -> Optional[str]:
+        if not self.coin_symbol(chain_id):
+            try:
+                await self.download()
+            except Exception:
+                pass
+        return self.coin_symbol(chain_id)
+
+
+chain_index = ChainIndex()
@@ -1,13 +1,16 @@
 from typing import Optional
-import requests
 
 from dataclasses import dataclass
 from decimal import Decimal
-from typing import Union
+from typing import Dict, List, Union
 from web3 import Web3
+from web3.eth import AsyncEth
 from eth_utils import to_wei, from_wei
 
 from data import config
+from sdk.data.chains import chain_index
+from sdk.providers import session_pool
+from sdk.rate_limiter import TokenBucket, rate_limiter
 
 
 @dataclass
@@ -85,64 +88,171 @@ class DefaultABIs:
             'type': 'function'
         }]
 
+    Multicall3 = [
+        {
+            'inputs': [
+                {
+                    'components': [
+                        {'name': 'target', 'type': 'address'},
+                        {'name': 'allowFailure', 'type': 'bool'},
+                        {'name': 'callData', 'type': 'bytes'}
+                    ],
+                    'name': 'calls',
+                    'type': 'tuple[]'
+                }
+            ],
+            'name': 'aggregate3',
+            'outputs': [
+                {
+                    'components': [
+                        {'name': 'success', 'type': 'bool'},
+                        {'name': 'returnData', 'type': 'bytes'}
+                    ],
+                    'name': 'returnData',
+                    'type': 'tuple[]'
+                }
+            ],
+            'stateMutability': 'payable',
+            'type': 'function'
+        },
+        {
+            'inputs': [{'name': 'addr', 'type': 'address'}],
+            'name': 'getEthBalance',
+            'outputs': [{'name': 'balance', 'type': 'uint256'}],
+            'stateMutability': 'view',
+            'type': 'function'
+        }]
+
 
 @dataclass
 class API:
     key: str
     url: str
     docs: str
+    rps: float = 5
+
+    @property
+    def rate_limiter(self) -> Optional[TokenBucket]:
+        return rate_limiter.bucket(f'{self.url}|{self.key}', rate=self.rps)
+
+    @staticmethod
+    def rate_limited(status: int, result: dict) -> bool:
+        # Etherscan-family explorers answer 200 with a NOTOK body when the key is over its limit
+        return status == 429 or (
+                isinstance(result, dict) and 'rate limit' in str(result.get('result', '')).lower()
+        )
+
+    async def get(self, **params) -> dict:
+        bucket = self.rate_limiter
+        session = await session_pool.session(self.url)
+        for attempt in range(session_pool.retries_429 + 1):
+            if bucket:
+                await bucket.acquire()
+            async with session.get(self.url, params={**params, 'apikey': self.key}) as response:
+                result = await response.json(content_type=None)
+                if not self.rate_limited(response.status, result) or attempt == session_pool.retries_429:
+                    return result
+                if bucket:
+                    bucket.penalize(session_pool.retry_after(response))
+
+
+POW10 = tuple(10 ** i for i in range(78))
+BPS = 10_000
+
+
+def pow10(decimals: int) -> int:
+    return POW10[decimals] if 0 <= decimals < len(POW10) else 10 ** decimals
 
 
 class TokenAmount:
-    Wei: int
-    Ether: Decimal
-    decimals: int
+    __slots__ = ('Wei', 'decimals', '_ether')
 
     def __init__(self, amount: Union[int, float, str, Decimal], decimals: int = 18, wei: bool = False) -> None:
         if wei:
             self.Wei: int = amount
-            self.Ether: Decimal = Decimal(str(amount)) / 10 ** decimals
+            self._ether: Optional[Decimal] = None
+
+        elif type(amount) is int:
+            self.Wei: int = amount * pow10(decimals)
+            self._ether = Decimal(amount)
 
         else:
-            self.Wei: int = int(Decimal(str(amount)) * 10 ** decimals)
-            self.Ether: Decimal = Decimal(str(amount))
+            self._ether = Decimal(str(amount))
+            self.Wei: int = int(self._ether * pow10(decimals))
 
         self.decimals = decimals
 
+    @classmethod
+    def from_wei(cls, amount: int, decimals: int = 18) -> 'TokenAmount':
+        token_amount = cls.__new__(cls)
+        token_amount.Wei = amount
+        token_amount.decimals = decimals
+        token_amount._ether = None
+        return token_amount
+
+    @classmethod
+    def from_units(cls, amount: Union[int, Decimal], decimals: int = 18) -> 'TokenAmount':
+        if type(amount) is int:
+            return cls.from_wei(amount * pow10(decimals), decimals)
+        return cls.from_wei(int(amount.scaleb(decimals)), decimals)
+
+    @property
+    def Ether(self) -> Decimal:
+        if self._ether is None:
+            self._ether = Decimal(self.Wei) / pow10(self.decimals)
+        return self._ether
+
+    def mul_div(self, numerator: int, denominator: int) -> 'TokenAmount':
+        return self.from_wei(self.Wei * numerator // denominator, self.decimals)
+
+    def min_amount(self, slippage_bps: int) -> 'TokenAmount':
+        return self.mul_div(BPS - slippage_bps, BPS)
+
     def __str__(self):
         return f'{self.Ether}'
 
 
 class Network:
-    def __init__(self, name: str, rpc: str, chain_id: Optional[int] = None, tx_type: int = 0,
-                 coin_symbol: Optional[str] = None, explorer: Optional[str] = None, api: Optional[API] = None
-                 ) -> None:
+    def __init__(self, name: str, rpc: Union[str, List[str]], chain_id: Optional[int] = None, tx_type: int = 0,
+                 coin_symbol: Optional[str] = None, explorer: Optional[str] = None, api: Optional[API] = None,
+                 rps: Optional[float] = None, burst: Optional[int] = None) -> None:
+        # rps=None is not unlimited: every RPC endpoint falls back to session_pool.rps (25 rps) and
+        # session_pool.burst; pass rps=0 to disable the limit or rate_limiter.configure() to override it
         self.name: str = name.lower()
-        self.rpc: str = rpc
+        self.rpcs: List[str] = [rpc] if isinstance(rpc, str) else list(rpc)
+        self.rpc: str = self.rpcs[0]
         self.chain_id: Optional[int] = chain_id
         self.tx_type: int = tx_type
         self.coin_symbol: Optional[str] = coin_symbol
         self.explorer: Optional[str] = explorer
         self.api: Optional[API] = api
+        self.rps: Optional[float] = rps
+        self.burst: Optional[int] = burst
+
+        if not self.coin_symbol and self.chain_id:
+            self.coin_symbol = chain_index.coin_symbol(self.chain_id)
 
+        if self.coin_symbol:
+            self.coin_symbol = self.coin_symbol.upper()
+
+    async def resolve(self) -> 'Network':
         if not self.chain_id:
             try:
-                self.chain_id = Web3(Web3.HTTPProvider(self.rpc)).eth.chain_id
+                w3 = Web3(
+                    provider=session_pool.provider(endpoint_uris=self.rpcs, rps=self.rps, burst=self.burst),
+                    modules={'eth': (AsyncEth,)},
+                    middlewares=[]
+                )
+                self.chain_id = await w3.eth.chain_id
             except:
                 pass
 
-        if not self.coin_symbol:
-            try:
-                response = requests.get('https://chainid.network/chains.json').json()
-                for network in response:
-                    if network['chainId'] == self.chain_id:
-                        self.coin_symbol = network['nativeCurrency']['symbol']
-                        break
-            except:
-                pass
+        if not self.coin_symbol and self.chain_id:
+            self.coin_symbol = await chain_index.resolve_coin_symbol(self.chain_id)
 
         if self.coin_symbol:
             self.coin_symbol = self.coin_symbol.upper()
+        return self
 
 
 class Networks:
@@ -320,21 +430,36 @@ class Networks:
     )
 
 
+def denomination(unit: str) -> property:
+    def getter(self: 'Unit') -> Decimal:
+        if self._denominations is None:
+            self._denominations = {}
+        if unit not in self._denominations:
+            self._denominations[unit] = from_wei(self.Wei, unit)
+        return self._denominations[unit]
+
+    return property(getter)
+
+
 class Unit:
+    __slots__ = ('unit', 'decimals', 'Wei', '_denominations')
+
+    KWei: Decimal = denomination('kwei')
+    MWei: Decimal = denomination('mwei')
+    GWei: Decimal = denomination('gwei')
+    Szabo: Decimal = denomination('szabo')
+    Finney: Decimal = denomination('finney')
+    Ether: Decimal = denomination('ether')
+    KEther: Decimal = denomination('kether')
+    MEther: Decimal = denomination('mether')
+    GEther: Decimal = denomination('gether')
+    TEther: Decimal = denomination('tether')
+
     def __init__(self, amount: Union[int, float, str, Decimal], unit: str) -> None:
         self.unit = unit
         self.decimals = 18
-        self.Wei: int = to_wei(amount, self.unit)
-        self.KWei: Decimal = from_wei(self.Wei, 'kwei')
-        self.MWei: Decimal = from_wei(self.Wei, 'mwei')
-        self.GWei: Decimal = from_wei(self.Wei, 'gwei')
-        self.Szabo: Decimal = from_wei(self.Wei, 'szabo')
-        self.Finney: Decimal = from_wei(self.Wei, 'finney')
-        self.Ether: Decimal = from_wei(self.Wei, 'ether')
-        self.KEther: Decimal = from_wei(self.Wei, 'kether')
-        self.MEther: Decimal = from_wei(self.Wei, 'mether')
-        self.GEther: Decimal = from_wei(self.Wei, 'gether')
-        self.TEther: Decimal = from_wei(self.Wei, 'tether')
+        self.Wei: int = amount if unit == 'wei' and type(amount) is int else to_wei(amount, unit)
+        self._denominations: Optional[Dict[str, Decimal]] = None
 
     def __str__(self):
         return f'{self.Ether}'
@@ -388,7 +513,7 @@ class Unit:
             return Wei(self.Wei * other.Wei)
 
         elif isinstance(other, int):
-            return Wei(self.Wei * Decimal(str(other)))
+            return Wei(self.Wei * other)
 
         elif isinstance(other, float):
             if self.unit == 'gwei':
@@ -457,14 +582,14 @@ class Unit:
 
     def __le__(self, other):
         # todo: сделать самостоятельно
-        if isinstance((other, (Unit, TokenAmount))):
+        if isinstance(other, (Unit, TokenAmount)):
             if self.decimals != other.decimals:
                 raise ArithmeticError('The values have different decimals!')
 
             return self.Wei <= other.Wei
 
         elif isinstance(other, int):
-            return self.GWei <= other
+            return self.Wei <= other
 
         elif isinstance(other, float):
             if self.unit == 'gwei':
@@ -559,59 +684,81 @@ class Unit:
 
 
 class Wei(Unit):
+    __slots__ = ()
+
     def __init__(self, amount: Union[int, float, str, Decimal]) -> None:
         super().__init__(amount, 'wei')
 
 
 class KWei(Unit):
+    __slots__ = ()
+
     def __init__(self, amount: Union[int, float, str, Decimal]) -> None:
         super().__init__(amount, 'kwei')
 
 
 class MWei(Unit):
+    __slots__ = ()
+
     def __init__(self, amount: Union[int, float, str, Decimal]) -> None:
         super().__init__(amount, 'mwei')
 
 
 class GWei(Unit):
+    __slots__ = ()
+
     def __init__(self, amount: Union[int, float, str, Decimal]) -> None:
         super().__init__(amount, 'gwei')
 
 
 class Szabo(Unit):
+    __slots__ = ()
+
     def __init__(self, amount: Union[int, float, str, Decimal]) -> None:
         super().__init__(amount, 'szabo')
 
 
 class Finney(Unit):
+    __slots__ = ()
+
     def __init__(self, amount: Union[int, float, str, Decimal]) -> None:
         super().__init__(amount, 'finney')
 
 
 class Ether(Unit):
+    __slots__ = ()
+
     def __init__(self, amount: Union[int, float, str, Decimal]) -> None:
         super().__init__(amount, 'ether')
 
 
 # todo: сделать самостоятельно
 class KEther(Unit):
+    __slots__ = ()
+
     def __init__(self, amount: Union[int, float, str, Decimal]) -> None:
         super().__init__(amount, 'kether')
 
 
 # todo: сделать самостоятельно
 class MEther(Unit):
+    __slots__ = ()
+
     def __init__(self, amount: Union[int, float, str, Decimal]) -> None:
         super().__init__(amount, 'mether')
 
 
 # todo: сделать самостоятельно
 class GEther(Unit):
+    __slots__ = ()
+
     def __init__(self, amount: Union[int, float, str, Decimal]) -> None:
         super().__init__(amount, 'gether')
 
 
 # todo: сделать самостоятельно
 class TEther(Unit):
+    __slots__ = ()
+
     def __init__(self, amount: Union[int, float, str, Decimal]) -> None:
         super().__init__(amount, 'tether')
@@ -0,0 +1,113 @@
+"""Multicall3 reader. lesson_3/utils/multicall.py and lesson_4/utils/multicall.py are ports of this
+module onto py_eth_async clients; change them together."""
+import asyncio
+from typing import Dict, List, Optional, Tuple
+
+from eth_abi import encode
+from eth_typing import ChecksumAddress
+from web3 import Web3
+
+from sdk.data.models import DefaultABIs, Wei, TokenAmount
+
+
+class Multicall:
+    address = Web3.to_checksum_address('0xcA11bde05977b3631167028862bE2a173976CA11')
+
+    class Selectors:
+        balanceOf = bytes.fromhex('70a08231')
+        allowance = bytes.fromhex('dd62ed3e')
+        decimals = bytes.fromhex('313ce567')
+        symbol = bytes.fromhex('95d89b41')
+        getEthBalance = bytes.fromhex('4d2301cc')
+
+    def __init__(self, client, chunk_size: int = 500) -> None:
+        self.client = client
+        self.chunk_size = chunk_size
+
+    async def aggregate(self, calls: List[Tuple[str, bytes]],
+                        block: Optional[int] = None) -> List[Optional[bytes]]:
+        contract = await self.client.contracts.get(contract_address=self.address, abi=DefaultABIs.Multicall3)
+        if block is None:
+            block = await self.client.w3.eth.block_number
+
+        chunks = [calls[i:i + self.chunk_size] for i in range(0, len(calls), self.chunk_size)]
+        results = await asyncio.gather(*[
+            contract.functions.aggregate3([(target, True, data) for target, data in chunk]).call(
+                block_identifier=block
+            ) for chunk in chunks
+        ])
+        return [data if success else None for chunk in results for success, data in chunk]
+
+    def decode_uint(self, data: Optional[bytes]) -> Optional[int]:
+        if not data:
+            return None
+        return self.client.w3.codec.decode(['uint256'], data)[0]
+
+    def decode_string(self, data: Optional[bytes]) -> Optional[str]:
+        if not data:
+            return None
+        try:
+            return self.client.w3.codec.decode(['string'], data)[0]
+        except Exception:
+            return data[:32].rstrip(b'\x00').decode(errors='ignore') or None
+
+    async def native_balances(self, addresses: List[str], block: Optional[int] = None) -> Dict[ChecksumAddress, Wei]:
+        addresses = [Web3.to_checksum_address(address) for address in addresses]
+        results = await self.aggregate(
+            [(self.address, self.Selectors.getEthBalance + encode(['address'], [address])) for address in addresses],
+            block=block
+        )
+        return {address: Wei(self.decode_uint(data)) for address, data in zip(addresses, results) if data}
+
+    async def decimals(self, tokens: List[str], block: Optional[int] = None) -> Dict[ChecksumAddress, int]:
+        tokens = list(dict.fromkeys(Web3.to_checksum_address(token) for token in tokens))
+        results = await self.aggregate([(token, self.Selectors.decimals) for token in tokens], block=block)
+        return {token: self.decode_uint(data) for token, data in zip(tokens, results) if data}
+
+    async def symbols(self, tokens: List[str], block: Optional[int] = None) -> Dict[ChecksumAddress, str]:
+        tokens = list(dict.fromkeys(Web3.to_checksum_address(token) for token in tokens))
+        results = await self.aggregate([(token, self.Selectors.symbol) for token in tokens], block=block)
+        symbols = {token: self.decode_string(data) for token, data in zip(tokens, results)}
+        return {token: symbol for token, symbol in symbols.items() if symbol}
+
+    async def balances(self, pairs: List[Tuple[str, str]],
+                       block: Optional[int] = None) -> Dict[Tuple[ChecksumAddress, ChecksumAddress], TokenAmount]:
+        pairs = [(Web3.to_checksum_address(address), Web3.to_checksum_address(token)) for address, token in pairs]
+        calls = [
+            (token, self.Selectors.balanceOf + encode(['address'], [address])) for address, token in pairs
+        ]
+        return await self._token_amounts(keys=pairs, tokens=[token for address, token in pairs], calls=calls,
+                                         block=block)
+
+    async def allowances(
+            self, triples: List[Tuple[str, str, str]], block: Optional[int] = None
+    ) -> Dict[Tuple[ChecksumAddress, ChecksumAddress, ChecksumAddress], TokenAmount]:
+        triples = [
+            (Web3.to_checksum_address(owner), Web3.to_checksum_address(token), Web3.to_checksum_address(spender))
+            for owner, token, spender in triples
+        ]
+        calls = [
+            (token, self.Selectors.allowance + encode(['address', 'address'], [owner, spender]))
+            for owner, token, spender in triples
+        ]
+        return await self._token_amounts(keys=triples, tokens=[token for owner, token, spender in triples],
+                                         calls=calls, block=block)
+
+    async def _token_amounts(self, keys: list, tokens: List[ChecksumAddress], calls: List[Tuple[str, bytes]],
+                             block: Optional[int] = None) -> dict:
+        if block is None:
+            block = await self.client.w3.eth.block_number
+
+        unique_tokens = list(dict.fromkeys(tokens))
+        results = await self.aggregate(
+            calls + [(token, self.Selectors.decimals) for token in unique_tokens], block=block
+        )
+        decimals = {
+            token: self.decode_uint(data) for token, data in zip(unique_tokens, results[len(calls):]) if data
+        }
+
+        amounts = {}
+        for key, token, data in zip(keys, tokens, results[:len(calls)]):
+            if data and token in decimals:
+                amounts[key] = TokenAmount(amount=self.decode_uint(data), decimals=decimals[token], wei=True)
+        return amounts
@@ -0,0 +1,284 @@
+import asyncio
+import json
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import aiohttp
+from web3 import Web3
+from web3.types import RPCEndpoint, RPCResponse
+
+from sdk.rate_limiter import rate_limiter
+
+
+batch_window: ContextVar[Optional[float]] = ContextVar('batch_window', default=None)
+
+
+@asynccontextmanager
+async def batch(window: float = 0.005):
+    token = batch_window.set(window)
+    try:
+        yield
+    finally:
+        batch_window.reset(token)
+
+
+class EndpointStats:
+    def __init__(self, window: int = 100, max_errors: int = 3, cooldown: float = 30) -> None:
+        self.max_errors = max_errors
+        self.cooldown = cooldown
+        self.latencies = deque(maxlen=window)
+        self.results = deque(maxlen=window)
+        self.consecutive_errors = 0
+        self.down_until = 0.
+
+    @property
+    def healthy(self) -> bool:
+        return time.monotonic() >= self.down_until
+
+    @property
+    def error_rate(self) -> float:
+        if not self.results:
+            return 0.
+        return self.results.count(False) / len(self.results)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        latencies = sorted(self.latencies)
+        return latencies[int(q * (len(latencies) - 1))]
+
+    def score(self) -> float:
+        return (self.percentile(0.5) or 0.) * (1 + 10 * self.error_rate) + 10 * self.error_rate
+
+    def success(self, latency: float) -> None:
+        self.latencies.append(latency)
+        self.results.append(True)
+        self.consecutive_errors = 0
+
+    def error(self) -> None:
+        self.results.append(False)
+        self.consecutive_errors += 1
+        if self.consecutive_errors >= self.max_errors:
+            self.down_until = time.monotonic() + self.cooldown
+
+
+class PooledHTTPProvider(Web3.AsyncHTTPProvider):
+    write_methods = {'eth_sendRawTransaction', 'eth_sendTransaction'}
+
+    def __init__(self, endpoint_uris: List[str], pool: 'SessionPool', request_kwargs: Optional[Dict[str, Any]] = None,
+                 batch_window: float = 0, hedge: bool = False, hedge_delay: float = 0.5) -> None:
+        super().__init__(endpoint_uri=endpoint_uris[0], request_kwargs=request_kwargs)
+        self.endpoint_uris = endpoint_uris
+        self.pool = pool
+        self.batch_window = batch_window
+        self.hedge = hedge
+        self.hedge_delay = hedge_delay
+        self.queue: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+        self.flush_handle: Optional[asyncio.TimerHandle] = None
+
+    async def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        request_data = self.encode_rpc_request(method, params)
+        window = batch_window.get()
+        if window is None:
+            window = self.batch_window
+        if not window:
+            raw_response = await self.send(request_data, hedge=method not in self.write_methods)
+            return self.decode_rpc_response(raw_response)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.queue.append((json.loads(request_data), future))
+        if not self.flush_handle:
+            self.flush_handle = loop.call_later(window, self.flush)
+        return await future
+
+    def flush(self) -> None:
+        if self.flush_handle:
+            self.flush_handle.cancel()
+            self.flush_handle = None
+        queue, self.queue = self.queue, []
+        if queue:
+            asyncio.ensure_future(self.send_batch(queue))
+
+    async def send_batch(self, queue: List[Tuple[Dict[str, Any], asyncio.Future]]) -> None:
+        try:
+            raw_response = await self.send(
+                json.dumps([request for request, future in queue]).encode(),
+                hedge=all(request['method'] not in self.write_methods for request, future in queue)
+            )
+            responses = self.decode_rpc_response(raw_response)
+            if not isinstance(responses, list):
+                raise ValueError(f'Batch request failed: {responses}')
+
+        except Exception as err:
+            for request, future in queue:
+                if not future.done():
+                    future.set_exception(err)
+            return
+
+        responses = {response.get('id'): response for response in responses}
+        for request, future in queue:
+            if future.done():
+                continue
+            if request['id'] in responses:
+                future.set_result(responses[request['id']])
+            else:
+                future.set_exception(ValueError(f"No response for request {request['id']} in batch"))
+
+    async def send(self, data: bytes, hedge: bool = False) -> bytes:
+        endpoint_uris = self.pool.rank(self.endpoint_uris)
+        if hedge and self.hedge and len(endpoint_uris) > 1:
+            return await self.send_hedged(data, endpoint_uris)
+
+        last_error = None
+        for endpoint_uri in endpoint_uris:
+            try:
+                return await self.pool.post(endpoint_uri, data, **self.get_request_kwargs())
+            except Exception as err:
+                last_error = err
+        raise last_error
+
+    async def send_hedged(self, data: bytes, endpoint_uris: List[str]) -> bytes:
+        tasks = {asyncio.ensure_future(self.pool.post(endpoint_uris[0], data, **self.get_request_kwargs()))}
+        delay = self.pool.stats(endpoint_uris[0]).percentile(0.95) or self.hedge_delay
+        done, pending = await asyncio.wait(tasks, timeout=delay)
+        fallback_uris = endpoint_uris[1:]
+        if not done:
+            tasks.add(asyncio.ensure_future(self.pool.post(endpoint_uris[1], data, **self.get_request_kwargs())))
+            fallback_uris = endpoint_uris[2:]
+
+        last_error = None
+        while tasks:
+            done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception():
+                    last_error = task.exception()
+                    continue
+                for other in tasks:
+                    other.cancel()
+                return task.result()
+
+        for endpoint_uri in fallback_uris:
+            try:
+                return await self.pool.post(endpoint_uri, data, **self.get_request_kwargs())
+            except Exception as err:
+                last_error = err
+        raise last_error
+
+
+class SessionPool:
+    def __init__(self, limit_per_endpoint: int = 100, idle_timeout: float = 60, request_timeout: float = 10,
+                 rps: float = 25, burst: Optional[int] = None, retries_429: int = 1) -> None:
+        self.limit_per_endpoint = limit_per_endpoint
+        self.rps = rps
+        self.burst = burst
+        self.retries_429 = retries_429
+        self.idle_timeout = idle_timeout
+        self.request_timeout = request_timeout
+        self.limits: Dict[str, int] = {}
+        self.endpoint_stats: Dict[str, EndpointStats] = {}
+        self.providers: Dict[Tuple, PooledHTTPProvider] = {}
+        self.sessions: Dict[str, aiohttp.ClientSession] = {}
+        self.last_used: Dict[str, float] = {}
+
+    def configure(self, endpoint_uri: str, limit: int) -> None:
+        self.limits[endpoint_uri] = limit
+
+    def stats(self, endpoint_uri: str) -> EndpointStats:
+        if endpoint_uri not in self.endpoint_stats:
+            self.endpoint_stats[endpoint_uri] = EndpointStats()
+        return self.endpoint_stats[endpoint_uri]
+
+    def rank(self, endpoint_uris: List[str]) -> List[str]:
+        return sorted(endpoint_uris, key=lambda endpoint_uri: (
+            not self.stats(endpoint_uri).healthy, self.stats(endpoint_uri).score()
+        ))
+
+    def provider(self, endpoint_uris: Union[str, List[str]], proxy: Optional[str] = None,
+                 headers: Optional[Dict[str, str]] = None, hedge: bool = False, batch_window: float = 0,
+                 rps: Optional[float] = None, burst: Optional[int] = None) -> PooledHTTPProvider:
+        if isinstance(endpoint_uris, str):
+            endpoint_uris = [endpoint_uris]
+        for endpoint_uri in endpoint_uris:
+            rate_limiter.bucket(
+                endpoint_uri, rate=self.rps if rps is None else rps, burst=self.burst if burst is None else burst
+            )
+        key = (tuple(endpoint_uris), proxy, tuple(sorted((headers or {}).items())), hedge, batch_window)
+        if key not in self.providers:
+            self.providers[key] = PooledHTTPProvider(
+                endpoint_uris=list(endpoint_uris),
+                pool=self,
+                request_kwargs={
+                    'proxy': proxy,
+                    'headers': headers,
+                    'timeout': aiohttp.ClientTimeout(total=self.request_timeout)
+                },
+                batch_window=batch_window,
+                hedge=hedge
+            )
+        return self.providers[key]
+
+    async def session(self, endpoint_uri: str) -> aiohttp.ClientSession:
+        await self.evict_idle()
+        session = self.sessions.get(endpoint_uri)
+        if not session or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limits.get(endpoint_uri, self.limit_per_endpoint),
+                keepalive_timeout=self.idle_timeout
+            )
+            session = aiohttp.ClientSession(connector=connector)
+            self.sessions[endpoint_uri] = session
+        self.last_used[endpoint_uri] = time.monotonic()
+        return session
+
+    @staticmethod
+    def retry_after(response: aiohttp.ClientResponse) -> Optional[float]:
+        retry_after = response.headers.get('Retry-After')
+        return float(retry_after) if retry_after and retry_after.isdigit() else None
+
+    async def post(self, endpoint_uri: str, data: bytes, **kwargs) -> bytes:
+        session = await self.session(endpoint_uri)
+        stats = self.stats(endpoint_uri)
+        for attempt in range(self.retries_429 + 1):
+            await rate_limiter.acquire(endpoint_uri)
+            started_at = time.monotonic()
+            try:
+                async with session.post(endpoint_uri, data=data, **kwargs) as response:
+                    delay = None
+                    if response.status == 429:
+                        delay = self.retry_after(response)
+                        rate_limiter.penalize(endpoint_uri, delay=delay)
+                    if response.status != 429 or attempt == self.retries_429:
+                        response.raise_for_status()
+                        raw_response = await response.read()
+                        stats.success(time.monotonic() - started_at)
+                        return raw_response
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                stats.error()
+                raise
+
+            if not rate_limiter.bucket(endpoint_uri):
+                await asyncio.sleep(delay or 1)
+
+    async def evict_idle(self) -> None:
+        now = time.monotonic()
+        for endpoint_uri, last_used in list(self.last_used.items()):
+            if now - last_used > self.idle_timeout:
+                session = self.sessions.pop(endpoint_uri, None)
+                del self.last_used[endpoint_uri]
+                if session:
+                    await session.close()
+
+    async def close(self) -> None:
+        sessions = list(self.sessions.values())
+        self.sessions.clear()
+        self.last_used.clear()
+        await asyncio.gather(*[session.close() for session in sessions])
+
+
+session_pool = SessionPool()
@@ -0,0 +1,89 @@
+import asyncio
+import time
+from typing import Dict, List, Optional, Tuple, Union
+
+import aiohttp
+import requests
+
+from sdk.exceptions import InvalidProxy
+
+
+class ProxyChecker:
+    url = 'http://eth0.me/'
+
+    def __init__(self, ttl: float = 600, concurrency: int = 100, timeout: float = 10) -> None:
+        self.ttl = ttl
+        self.timeout = timeout
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.results: Dict[str, Tuple[float, Optional[str], Optional[str]]] = {}
+        self.in_flight: Dict[str, asyncio.Future] = {}
+
+    @staticmethod
+    def normalize(proxy: str) -> str:
+        if 'http' not in proxy:
+            proxy = f'http://{proxy}'
+        return proxy
+
+    def cached(self, proxy: str) -> Optional[str]:
+        result = self.results.get(proxy)
+        if not result or time.monotonic() - result[0] > self.ttl:
+            return None
+
+        checked_at, your_ip, error = result
+        if error:
+            raise InvalidProxy(error)
+        return your_ip
+
+    def save(self, proxy: str, your_ip: Optional[str] = None, error: Optional[str] = None) -> None:
+        self.results[proxy] = (time.monotonic(), your_ip, error)
+
+    def check_sync(self, proxy: str) -> str:
+        proxy = self.normalize(proxy)
+        your_ip = self.cached(proxy)
+        if your_ip:
+            return your_ip
+
+        try:
+            your_ip = requests.get(self.url, proxies={'http': proxy, 'https': proxy}, timeout=self.timeout).text.rstrip()
+        except Exception as err:
+            self.save(proxy, error=str(err))
+            raise InvalidProxy(str(err))
+
+        self.save(proxy, your_ip=your_ip)
+        return your_ip
+
+    async def check(self, proxy: str) -> str:
+        proxy = self.normalize(proxy)
+        your_ip = self.cached(proxy)
+        if your_ip:
+            return your_ip
+
+        if proxy not in self.in_flight:
+            self.in_flight[proxy] = asyncio.ensure_future(self._check(proxy))
+        try:
+            return await asyncio.shield(self.in_flight[proxy])
+        finally:
+            if self.in_flight.get(proxy) and self.in_flight[proxy].done():
+                del self.in_flight[proxy]
+
+    async def _check(self, proxy: str) -> str:
+        async with self.semaphore:
+            try:
+                async with aiohttp.ClientSession() as session:
+                    async with session.get(
+                            self.url, proxy=proxy, timeout=aiohttp.ClientTimeout(total=self.timeout)
+                    ) as response:
+                        your_ip = (await response.text()).rstrip()
+            except Exception as err:
+                self.save(proxy, error=str(err))
+                raise InvalidProxy(str(err))
+
+        self.save(proxy, your_ip=your_ip)
+        return your_ip
+
+    async def check_many(self, proxies: List[str]) -> Dict[str, Union[str, InvalidProxy]]:
+        results = await asyncio.gather(*[self.check(proxy) for proxy in proxies], return_exceptions=True)
+        return dict(zip(proxies, results))
+
+
+proxy_checker = ProxyChecker()
@@ -0,0 +1,73 @@
+import asyncio
+import time
+from typing import Dict, Optional, Tuple
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: Optional[int] = None) -> None:
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self.tokens = float(self.burst)
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.
+        self.lock = asyncio.Lock()
+
+    def refill(self) -> None:
+        now = time.monotonic()
+        if now > self.updated_at:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+
+    async def acquire(self, tokens: float = 1) -> None:
+        # reserve under the lock, sleep outside it: a negative balance queues the waiters in arrival order
+        async with self.lock:
+            self.refill()
+            self.tokens -= tokens
+            wait = max(0., self.updated_at - time.monotonic()) + max(0., -self.tokens) / self.rate
+
+        while wait > 0:
+            await asyncio.sleep(wait)
+            wait = self.blocked_until - time.monotonic()
+
+    def penalize(self, delay: Optional[float] = None) -> None:
+        self.blocked_until = max(self.blocked_until, time.monotonic() + (delay or 1 / self.rate))
+        self.tokens = min(self.tokens, 0.)
+        self.updated_at = max(self.updated_at, self.blocked_until)
+
+    async def __aenter__(self) -> 'TokenBucket':
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        pass
+
+
+class RateLimiter:
+    def __init__(self) -> None:
+        self.limits: Dict[str, Tuple[float, Optional[int]]] = {}
+        self.buckets: Dict[str, TokenBucket] = {}
+
+    def configure(self, key: str, rate: float, burst: Optional[int] = None) -> None:
+        self.limits[key] = (rate, burst)
+        self.buckets.pop(key, None)
+
+    def bucket(self, key: str, rate: Optional[float] = None, burst: Optional[int] = None) -> Optional[TokenBucket]:
+        if key not in self.buckets:
+            rate, burst = self.limits.get(key, (rate, burst))
+            if not rate:
+                return None
+            self.buckets[key] = TokenBucket(rate=rate, burst=burst)
+        return self.buckets[key]
+
+    async def acquire(self, key: str) -> None:
+        bucket = self.bucket(key)
+        if bucket:
+            await bucket.acquire()
+
+    def penalize(self, key: str, delay: Optional[float] = None) -> None:
+        bucket = self.bucket(key)
+        if bucket:
+            bucket.penalize(delay)
+
+
+rate_limiter = RateLimiter()
@@ -0,0 +1,128 @@
+"""Token metadata registry. lesson_4/utils/tokens.py is a port onto py_eth_async clients; change both together."""
+import asyncio
+import atexit
+import json
+import os
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from web3 import Web3
+
+from data import config
+
+
+class TokenRegistry:
+    def __init__(self, path: str = os.path.join(config.FILES_DIR, 'tokens.json'), max_size: int = 10_000,
+                 flush_interval: float = 5) -> None:
+        self.path = path
+        self.max_size = max_size
+        self.flush_interval = flush_interval
+        self.memory: OrderedDict[Tuple[int, str], Dict] = OrderedDict()
+        self.disk: Optional[Dict[str, Dict]] = None
+        self.dirty = False
+        self.flush_handle: Optional[asyncio.TimerHandle] = None
+        self.flush_loop: Optional[asyncio.AbstractEventLoop] = None
+        atexit.register(self.flush)
+
+    def load(self) -> Dict[str, Dict]:
+        if self.disk is None:
+            self.disk = {}
+            if os.path.exists(self.path):
+                with open(self.path) as file:
+                    self.disk = json.load(file)
+        return self.disk
+
+    def save(self) -> None:
+        data = self.load()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, 'w') as file:
+            json.dump(data, file)
+
+    def mark_dirty(self) -> None:
+        self.dirty = True
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+
+        if self.flush_handle is None or self.flush_handle.cancelled() or self.flush_loop is not loop:
+            if self.flush_handle is not None and self.flush_loop is not None and not self.flush_loop.is_closed():
+                self.flush_handle.cancel()
+            self.flush_handle = loop.call_later(self.flush_interval, self.flush)
+            self.flush_loop = loop
+
+    def flush(self) -> None:
+        if self.flush_handle is not None:
+            self.flush_handle.cancel()
+            self.flush_handle = None
+            self.flush_loop = None
+        if self.dirty:
+            self.dirty = False
+            self.save()
+
+    def get(self, chain_id: int, address: str) -> Dict:
+        key = (chain_id, Web3.to_checksum_address(address))
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            return self.memory[key]
+
+        metadata = self.load().get(f'{key[0]}:{key[1]}')
+        if metadata:
+            self.remember(key, metadata)
+        return metadata or {}
+
+    def set(self, chain_id: int, address: str, save: bool = True, **metadata) -> None:
+        key = (chain_id, Web3.to_checksum_address(address))
+        metadata = {**self.get(*key), **metadata}
+        self.remember(key, metadata)
+        self.load()[f'{key[0]}:{key[1]}'] = metadata
+        if save:
+            self.mark_dirty()
+
+    def remember(self, key: Tuple[int, str], metadata: Dict) -> None:
+        self.memory[key] = metadata
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_size:
+            self.memory.popitem(last=False)
+
+    async def decimals(self, client, address: str) -> int:
+        metadata = self.get(client.network.chain_id, address)
+        if 'decimals' not in metadata:
+            contract = await client.contracts.default_token(contract_address=Web3.to_checksum_address(address))
+            self.set(client.network.chain_id, address, decimals=await contract.functions.decimals().call())
+        return self.get(client.network.chain_id, address)['decimals']
+
+    async def symbol(self, client, address: str) -> str:
+        metadata = self.get(client.network.chain_id, address)
+        if 'symbol' not in metadata:
+            contract = await client.contracts.default_token(contract_address=Web3.to_checksum_address(address))
+            self.set(client.network.chain_id, address, symbol=await contract.functions.symbol().call())
+        return self.get(client.network.chain_id, address)['symbol']
+
+    async def warm(self, client, addresses: List[str]) -> None:
+        chain_id = client.network.chain_id
+        missing = [
+            address for address in addresses
+            if not {'decimals', 'symbol'} <= set(self.get(chain_id, address))
+        ]
+        if not missing:
+            return
+
+        block = await client.w3.eth.block_number
+        decimals, symbols = await asyncio.gather(
+            client.multicall.decimals(missing, block=block),
+            client.multicall.symbols(missing, block=block)
+        )
+        for address in missing:
+            metadata = {}
+            address = Web3.to_checksum_address(address)
+            if address in decimals:
+                metadata['decimals'] = decimals[address]
+            if address in symbols:
+                metadata['symbol'] = symbols[address]
+            if metadata:
+                self.set(chain_id, address, save=False, **metadata)
+        self.mark_dirty()
+
+
+token_registry = TokenRegistry()
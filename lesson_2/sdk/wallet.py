@@ -1,7 +1,9 @@
+import asyncio
 from typing import Optional, Union
 
 from eth_typing import ChecksumAddress
 from sdk.data.models import Wei, TokenAmount
+from sdk.tokens import token_registry
 
 from web3 import Web3
 
@@ -21,11 +23,11 @@ class Wallet:
 
         token_address = Web3.to_checksum_address(token_address)
         contract = await self.client.contracts.default_token(contract_address=token_address)
-        return TokenAmount(
-            amount=await contract.functions.balanceOf(address).call(),
-            decimals=await contract.functions.decimals().call(),
-            wei=True
+        amount, decimals = await asyncio.gather(
+            contract.functions.balanceOf(address).call(),
+            token_registry.decimals(client=self.client, address=token_address)
         )
+        return TokenAmount(amount=amount, decimals=decimals, wei=True)
 
     async def nonce(self, address: Optional[ChecksumAddress] = None) -> int:
         if not address:
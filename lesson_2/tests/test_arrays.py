@@ -0,0 +1,57 @@
+import pytest
+
+from sdk import arrays
+from sdk.arrays import UINT64_MAX, TokenAmountArray
+from sdk.data.models import TokenAmount
+
+VALUES = [5, 1, 9, 5, 0, 9, 3]
+
+
+@pytest.fixture(params=['numpy', 'python'])
+def backend(request, monkeypatch):
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setattr(arrays, 'np', None)
+    return request.param
+
+
+def test_compare_returns_a_list_of_bools(backend):
+    amounts = TokenAmountArray(VALUES, decimals=6)
+    mask = amounts >= TokenAmount.from_wei(5, 6)
+    assert type(mask) is list
+    assert mask == [True, False, True, True, False, True, False]
+    assert amounts.indices(mask) == [0, 2, 3, 5]
+    assert amounts.select(amounts < 5).values == [1, 0, 3]
+    assert (amounts > UINT64_MAX + 1) == [False] * len(VALUES)
+    assert (amounts > -1) == [True] * len(VALUES)
+
+
+def test_scale_falls_back_to_ints_outside_uint64(backend):
+    assert TokenAmountArray([0, 0]).scale(2 ** 70).values == [0, 0]
+    assert TokenAmountArray([3, 4]).scale(2 ** 70, 2 ** 70).values == [3, 4]
+    assert TokenAmountArray([2 ** 63, 1]).scale(4, 2).values == [2 ** 64, 2]
+    assert TokenAmountArray([10_000, 1]).min_amount(slippage_bps=50).values == [9_950, 0]
+
+
+def test_sum_sort_and_top(backend):
+    amounts = TokenAmountArray(VALUES)
+    assert amounts.sum().Wei == sum(VALUES)
+    assert TokenAmountArray([UINT64_MAX, UINT64_MAX]).sum().Wei == 2 * UINT64_MAX
+    assert amounts.argsort() == [4, 1, 6, 0, 3, 2, 5]
+    assert amounts.argsort(reverse=True) == [2, 5, 0, 3, 6, 1, 4]
+    assert amounts.sort().values == sorted(VALUES)
+    assert amounts.top(3) == [2, 5, 0]
+    assert amounts.top(0) == []
+
+
+def test_values_above_uint64_stay_exact(backend):
+    amounts = TokenAmountArray([2 ** 200, 1])
+    assert amounts.sum().Wei == 2 ** 200 + 1
+    assert (amounts > 1) == [True, False]
+    assert amounts.top(1) == [0]
+
+
+def test_from_amounts_rejects_mixed_decimals():
+    with pytest.raises(ArithmeticError):
+        TokenAmountArray.from_amounts([TokenAmount.from_wei(1, 6), TokenAmount.from_wei(1, 18)])
@@ -0,0 +1,29 @@
+import json
+import sys
+
+import pytest
+
+from benchmarks import suite
+
+
+@pytest.mark.parametrize('name', sorted(suite.benchmarks))
+def test_every_benchmark_runs(name):
+    setup, number = suite.benchmarks[name]
+    assert suite.measure(setup, number=1, repeat=1) > 0
+
+
+def test_every_benchmark_has_a_baseline():
+    assert set(suite.benchmarks) <= set(suite.load_baselines())
+
+
+def test_regressions_fail_and_legacy_paths_are_exempt(tmp_path, monkeypatch, capsys):
+    baselines = tmp_path / 'baselines.json'
+    baselines.write_text(json.dumps({'unit.wei': 1e-6, 'token_amount.from_wei.legacy': 1e-6}))
+    monkeypatch.setattr(suite, 'BASELINES', str(baselines))
+    monkeypatch.setattr(sys, 'argv', ['suite', '-k', 'unit.wei', '-s', '0.001', '-r', '1'])
+    assert suite.main() == 1
+    assert 'REGRESSION' in capsys.readouterr().out
+
+    monkeypatch.setattr(sys, 'argv', ['suite', '-k', 'from_wei.legacy', '-s', '0.001', '-r', '1', '--save'])
+    assert suite.main() == 0
+    assert json.loads(baselines.read_text())['token_amount.from_wei.legacy'] > 1e-6
@@ -0,0 +1,62 @@
+import asyncio
+import json
+
+from aiohttp import web
+
+from sdk.data.chains import ChainIndex
+from sdk.data.models import Network
+
+
+async def serve(routes):
+    app = web.Application()
+    app.router.add_routes(routes)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    return runner, f'http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/'
+
+
+def test_network_without_chain_id_does_no_io_until_resolved():
+    async def chain_id(request):
+        payload = await request.json()
+        return web.json_response({'jsonrpc': '2.0', 'id': payload['id'], 'result': hex(42161)})
+
+    async def run():
+        runner, url = await serve([web.post('/', chain_id)])
+        try:
+            network = Network(name='Custom', rpc=url, rps=0)
+            assert (network.chain_id, network.coin_symbol) == (None, None)
+            assert await network.resolve() is network
+            return network
+        finally:
+            await runner.cleanup()
+
+    network = asyncio.run(run())
+    assert (network.chain_id, network.coin_symbol) == (42161, 'ETH')
+
+
+def test_unknown_chain_is_downloaded_once_and_cached(tmp_path, monkeypatch):
+    downloads = []
+
+    async def chains(request):
+        downloads.append(request.path)
+        return web.json_response([{'chainId': 999_999, 'nativeCurrency': {'symbol': 'tst'}}])
+
+    async def run():
+        runner, url = await serve([web.get('/chains.json', chains)])
+        index = ChainIndex()
+        index.url = f'{url}chains.json'
+        index.local_path = str(tmp_path / 'missing.json')
+        index.cache_path = str(tmp_path / 'files' / 'chains.json')
+        try:
+            symbols = [await index.resolve_coin_symbol(999_999), await index.resolve_coin_symbol(1)]
+            return index, symbols
+        finally:
+            await runner.cleanup()
+
+    index, symbols = asyncio.run(run())
+    assert symbols == ['TST', None]
+    assert len(downloads) == 1
+    with open(index.cache_path) as file:
+        assert json.load(file) == {'999999': 'TST'}
@@ -0,0 +1,43 @@
+from copy import deepcopy
+
+from web3 import Web3
+from web3.eth import AsyncEth
+
+from sdk.contracts import ContractCache
+from sdk.data.models import DefaultABIs
+
+TOKEN = '0xaf88d065e77c8cC2239327C5EDb3A432268e5831'
+
+
+def make_w3() -> Web3:
+    return Web3(provider=Web3.HTTPProvider('http://127.0.0.1:1/'), modules={'eth': (AsyncEth,)}, middlewares=[])
+
+
+def test_address_case_shares_one_contract():
+    cache = ContractCache()
+    w3 = make_w3()
+    contract = cache.get(w3=w3, address=TOKEN.lower(), abi=DefaultABIs.Token)
+    assert contract.address == TOKEN
+    assert cache.get(w3=w3, address=TOKEN, abi=DefaultABIs.Token) is contract
+    assert len(cache.contracts) == 1
+
+
+def test_fingerprint_follows_abi_content():
+    cache = ContractCache()
+    abi = deepcopy(DefaultABIs.Token)
+    assert cache.fingerprint(abi) == cache.fingerprint(deepcopy(abi))
+
+    before = cache.fingerprint(abi)
+    abi.pop()
+    assert cache.fingerprint(abi) != before
+
+
+def test_lru_eviction():
+    cache = ContractCache(max_size=2)
+    w3 = make_w3()
+    addresses = ['0x' + f'{index:040x}' for index in range(1, 4)]
+    first = cache.get(w3=w3, address=addresses[0], abi=DefaultABIs.Token)
+    cache.get(w3=w3, address=addresses[1], abi=DefaultABIs.Token)
+    assert cache.get(w3=w3, address=addresses[0], abi=DefaultABIs.Token) is first
+    cache.get(w3=w3, address=addresses[2], abi=DefaultABIs.Token)
+    assert [key[1] for key in cache.contracts] == [addresses[0], addresses[2]]
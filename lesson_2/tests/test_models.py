@@ -0,0 +1,52 @@
+from decimal import Decimal
+
+import pytest
+
+from sdk.data.models import Ether, GWei, TEther, TokenAmount, Wei
+
+
+@pytest.mark.parametrize('decimals', [0, 6, 18, 77, 78, 80, 255])
+def test_units_and_wei_round_trip(decimals):
+    assert TokenAmount(3, decimals=decimals).Wei == 3 * 10 ** decimals
+    assert TokenAmount('1.5', decimals=decimals).Wei == 15 * 10 ** decimals // 10
+    assert TokenAmount.from_units(3, decimals).Wei == 3 * 10 ** decimals
+    assert TokenAmount.from_units(Decimal('1.5'), decimals).Wei == 15 * 10 ** decimals // 10
+    assert TokenAmount.from_wei(3 * 10 ** decimals, decimals).Ether == 3
+    assert TokenAmount(3 * 10 ** decimals, decimals=decimals, wei=True).Ether == 3
+
+
+def test_min_amount_is_exact_integer_math():
+    amount = TokenAmount.from_wei(123_456_789_012, 6)
+    assert amount.min_amount(slippage_bps=50).Wei == 123_456_789_012 * 9_950 // 10_000
+    assert amount.mul_div(1, 3).Wei == 41_152_263_004
+    assert amount.min_amount(slippage_bps=50).decimals == 6
+
+
+@pytest.mark.parametrize('cls', [Wei, GWei, Ether, TEther])
+def test_units_are_slotted(cls):
+    assert not hasattr(cls(1), '__dict__')
+    assert not hasattr(TokenAmount.from_wei(1, 6), '__dict__')
+
+
+def test_denominations_are_lazy_and_cached():
+    amount = Wei(1_500_000_000)
+    assert amount._denominations is None
+    assert amount.GWei == Decimal('1.5')
+    assert amount._denominations == {'gwei': Decimal('1.5')}
+    assert GWei('1.5').Wei == amount.Wei
+    assert Ether(2).Wei == 2 * 10 ** 18
+
+
+def test_unit_arithmetic_and_comparisons_stay_exact():
+    big = Wei(10 ** 30 + 1)
+    assert (big + 1).Wei == 10 ** 30 + 2
+    assert (big * 3).Wei == 3 * (10 ** 30 + 1)
+    assert (big - Wei(1)).Wei == 10 ** 30
+    assert Wei(1) <= Wei(1) and Wei(1) <= 2 and not Wei(3) <= 2
+    assert GWei(1) <= 1.0 and not GWei(2) <= 1.0
+    assert Ether(1) == TokenAmount(1)
+
+
+def test_token_amount_keeps_the_given_ether():
+    assert TokenAmount('0.1', decimals=6).Ether == Decimal('0.1')
+    assert TokenAmount(1234, decimals=2, wei=True).Ether == Decimal('12.34')
@@ -0,0 +1,86 @@
+import asyncio
+from types import SimpleNamespace
+
+from eth_abi import decode, encode
+from web3 import Web3
+
+from sdk.multicall import Multicall
+
+OWNER = '0x' + '11' * 20
+USDC = '0x' + 'aa' * 20
+BROKEN = '0x' + 'bb' * 20
+
+
+class Aggregate3:
+    def __init__(self, contract: 'FakeMulticall3', calls: list) -> None:
+        self.contract = contract
+        self.calls = calls
+
+    async def call(self, block_identifier=None):
+        self.contract.blocks.append(block_identifier)
+        return [self.contract.answer(target, data) for target, allow_failure, data in self.calls]
+
+
+class FakeMulticall3:
+    def __init__(self) -> None:
+        self.blocks = []
+        self.functions = SimpleNamespace(aggregate3=lambda calls: Aggregate3(self, calls))
+
+    @staticmethod
+    def answer(target: str, data: bytes):
+        selector = data[:4]
+        if target.lower() == BROKEN:
+            return False, b''
+        if selector == Multicall.Selectors.decimals:
+            return True, encode(['uint256'], [6])
+        if selector == Multicall.Selectors.symbol:
+            return True, encode(['string'], ['USDC'])
+        if selector == Multicall.Selectors.getEthBalance:
+            return True, encode(['uint256'], [10 ** 18])
+        owner = decode(['address'], data[4:36])[0]
+        return True, encode(['uint256'], [int(owner, 16) % 1000])
+
+
+def make_multicall(chunk_size: int = 500) -> Multicall:
+    contract = FakeMulticall3()
+
+    async def get(contract_address, abi):
+        return contract
+
+    class Eth:
+        @property
+        async def block_number(self):
+            return 77
+
+    client = SimpleNamespace(contracts=SimpleNamespace(get=get), w3=SimpleNamespace(eth=Eth(), codec=Web3().codec))
+    multicall = Multicall(client=client, chunk_size=chunk_size)
+    multicall.contract = contract
+    return multicall
+
+
+def test_balances_are_read_in_chunks_at_one_block():
+    multicall = make_multicall(chunk_size=2)
+    balances = asyncio.run(multicall.balances([(OWNER, USDC), (OWNER.upper().replace('0X', '0x'), USDC),
+                                               (OWNER, BROKEN)]))
+    key = (Web3.to_checksum_address(OWNER), Web3.to_checksum_address(USDC))
+    assert list(balances) == [key]
+    assert balances[key].Wei == int(OWNER, 16) % 1000 and balances[key].decimals == 6
+    assert multicall.contract.blocks == [77, 77, 77]
+
+
+def test_symbols_decimals_and_native_balances_skip_failed_calls():
+    multicall = make_multicall()
+
+    async def run():
+        return await asyncio.gather(
+            multicall.symbols([USDC, BROKEN, USDC]),
+            multicall.decimals([USDC, BROKEN]),
+            multicall.native_balances([OWNER]),
+        )
+
+    symbols, decimals, native = asyncio.run(run())
+    usdc = Web3.to_checksum_address(USDC)
+    assert symbols == {usdc: 'USDC'}
+    assert decimals == {usdc: 6}
+    assert native[Web3.to_checksum_address(OWNER)].Wei == 10 ** 18
+    assert multicall.decode_string(b'USDT'.ljust(32, b'\x00')) == 'USDT'
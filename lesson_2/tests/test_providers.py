@@ -0,0 +1,163 @@
+import asyncio
+import json
+
+from aiohttp import web
+from web3 import Web3
+from web3.eth import AsyncEth
+
+from sdk.providers import EndpointStats, SessionPool, batch
+
+
+class Node:
+    def __init__(self, block: int = 1, delay: float = 0, status: int = 200) -> None:
+        self.block = block
+        self.delay = delay
+        self.status = status
+        self.posts = []
+        self.runner = None
+        self.url = None
+
+    async def handle(self, request):
+        payload = json.loads(await request.read())
+        self.posts.append(payload)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.status != 200:
+            return web.Response(status=self.status)
+
+        def reply(item):
+            return {'jsonrpc': '2.0', 'id': item['id'], 'result': hex(self.block)}
+
+        return web.json_response([reply(item) for item in payload] if isinstance(payload, list) else reply(payload))
+
+    async def __aenter__(self) -> 'Node':
+        app = web.Application()
+        app.router.add_post('/', self.handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', 0)
+        await site.start()
+        self.url = f'http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/'
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.runner.cleanup()
+
+
+def make_w3(provider) -> Web3:
+    return Web3(provider=provider, modules={'eth': (AsyncEth,)}, middlewares=[])
+
+
+def test_clients_share_providers_and_sessions():
+    async def run():
+        pool = SessionPool()
+        async with Node(block=7) as node:
+            provider = pool.provider(node.url, headers={'user-agent': 'a'}, rps=0)
+            assert pool.provider([node.url], headers={'user-agent': 'a'}, rps=0) is provider
+            assert pool.provider(node.url, headers={'user-agent': 'b'}, rps=0) is not provider
+
+            blocks = await asyncio.gather(*[make_w3(provider).eth.block_number for _ in range(5)])
+            assert blocks == [7] * 5
+            assert list(pool.sessions) == [node.url]
+            assert await pool.session(node.url) is pool.sessions[node.url]
+            await pool.close()
+            assert not pool.sessions
+
+    asyncio.run(run())
+
+
+def test_idle_sessions_are_closed():
+    async def run():
+        pool = SessionPool(idle_timeout=0)
+        session = await pool.session('http://idle/')
+        await asyncio.sleep(0.01)
+        await pool.session('http://other/')
+        assert session.closed
+        assert list(pool.sessions) == ['http://other/']
+        await pool.close()
+
+    asyncio.run(run())
+
+
+def test_requests_within_a_window_go_out_as_one_batch():
+    async def run():
+        pool = SessionPool()
+        async with Node(block=9) as node:
+            w3 = make_w3(pool.provider(node.url, batch_window=0.01, rps=0))
+            blocks = await asyncio.gather(*[w3.eth.block_number for _ in range(10)])
+            await pool.close()
+            return blocks, node.posts
+
+    blocks, posts = asyncio.run(run())
+    assert blocks == [9] * 10
+    assert len(posts) == 1 and len(posts[0]) == 10
+
+
+def test_batch_context_overrides_the_provider_window():
+    async def run():
+        pool = SessionPool()
+        async with Node() as node:
+            w3 = make_w3(pool.provider(node.url, rps=0))
+            await asyncio.gather(*[w3.eth.block_number for _ in range(3)])
+            async with batch(0.01):
+                await asyncio.gather(*[w3.eth.block_number for _ in range(3)])
+            await pool.close()
+            return node.posts
+
+    posts = asyncio.run(run())
+    assert [isinstance(post, list) for post in posts] == [False, False, False, True]
+
+
+def test_failed_batch_fails_every_waiter():
+    async def run():
+        pool = SessionPool(retries_429=0)
+        async with Node(status=500) as node:
+            provider = pool.provider(node.url, batch_window=0.01, rps=0)
+            results = await asyncio.gather(
+                *[provider.make_request('eth_blockNumber', []) for _ in range(3)], return_exceptions=True
+            )
+            await pool.close()
+            return results, node.posts
+
+    results, posts = asyncio.run(run())
+    assert len(posts) == 1
+    assert all(isinstance(result, Exception) for result in results)
+
+
+def test_failover_skips_a_dead_endpoint_and_ranks_it_last():
+    async def run():
+        pool = SessionPool()
+        async with Node(status=500) as dead, Node(block=3) as alive:
+            provider = pool.provider([dead.url, alive.url], rps=0)
+            results = [await provider.make_request('eth_blockNumber', []) for _ in range(4)]
+            await pool.close()
+            return results, pool, dead, alive
+
+    results, pool, dead, alive = asyncio.run(run())
+    assert [result['result'] for result in results] == ['0x3'] * 4
+    assert len(dead.posts) == 1
+    assert pool.rank([dead.url, alive.url]) == [alive.url, dead.url]
+
+
+def test_endpoint_cools_down_after_consecutive_errors():
+    stats = EndpointStats(max_errors=2, cooldown=60)
+    stats.error()
+    assert stats.healthy
+    stats.error()
+    assert not stats.healthy
+    assert stats.error_rate == 1
+
+
+def test_hedged_read_returns_the_fastest_endpoint():
+    async def run():
+        pool = SessionPool()
+        async with Node(block=1, delay=0.5) as slow, Node(block=2) as fast:
+            provider = pool.provider([slow.url, fast.url], hedge=True, rps=0)
+            provider.hedge_delay = 0.05
+            read = await provider.make_request('eth_blockNumber', [])
+            await pool.close()
+            return read, slow, fast
+
+    read, slow, fast = asyncio.run(run())
+    assert read['result'] == '0x2'
+    assert len(slow.posts) == 1 and len(fast.posts) == 1
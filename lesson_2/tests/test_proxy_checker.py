@@ -0,0 +1,46 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+
+from sdk.exceptions import InvalidProxy
+from sdk.proxy_checker import ProxyChecker
+
+
+def test_concurrent_checks_share_one_request_and_results_are_cached():
+    requests = []
+
+    async def handler(request):
+        requests.append(str(request.url))
+        await asyncio.sleep(0.05)
+        return web.Response(text='1.2.3.4\n')
+
+    async def run():
+        app = web.Application()
+        app.router.add_get('/', handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        proxy = f'127.0.0.1:{site._server.sockets[0].getsockname()[1]}'
+        checker = ProxyChecker(ttl=60)
+        try:
+            results = await asyncio.gather(*[checker.check(proxy) for _ in range(5)])
+            assert await checker.check(f'http://{proxy}') == '1.2.3.4'
+            return results
+        finally:
+            await runner.cleanup()
+
+    assert asyncio.run(run()) == ['1.2.3.4'] * 5
+    assert len(requests) == 1
+
+
+def test_failures_are_cached_until_ttl():
+    checker = ProxyChecker(ttl=60)
+    checker.save('http://bad:1', error='refused')
+    with pytest.raises(InvalidProxy):
+        asyncio.run(checker.check('bad:1'))
+    assert asyncio.run(checker.check_many(['bad:1']))['bad:1'].args == ('refused',)
+
+    checker.ttl = -1
+    assert checker.cached('http://bad:1') is None
@@ -0,0 +1,80 @@
+import asyncio
+import time
+
+from aiohttp import web
+
+from sdk.data.models import API
+from sdk.providers import session_pool
+from sdk.rate_limiter import RateLimiter, TokenBucket
+
+
+def test_waiters_sleep_outside_the_lock_in_arrival_order():
+    async def run():
+        bucket = TokenBucket(rate=20, burst=1)
+        order = []
+
+        async def take(index):
+            await bucket.acquire()
+            order.append(index)
+
+        started_at = time.monotonic()
+        tasks = [asyncio.ensure_future(take(index)) for index in range(5)]
+        await asyncio.sleep(0.01)
+        assert not bucket.lock.locked()
+        await asyncio.gather(*tasks)
+        return order, time.monotonic() - started_at
+
+    order, elapsed = asyncio.run(run())
+    assert order == [0, 1, 2, 3, 4]
+    assert 0.18 <= elapsed < 0.5
+
+
+def test_penalize_blocks_new_and_sleeping_waiters():
+    async def run():
+        bucket = TokenBucket(rate=100, burst=1)
+        await bucket.acquire()
+        started_at = time.monotonic()
+        sleeping = asyncio.ensure_future(bucket.acquire())
+        await asyncio.sleep(0)
+        bucket.penalize(delay=0.2)
+        await asyncio.gather(sleeping, bucket.acquire())
+        return time.monotonic() - started_at
+
+    assert asyncio.run(run()) >= 0.2
+
+
+def test_configured_limit_wins_and_zero_rate_disables():
+    limiter = RateLimiter()
+    limiter.configure('http://node/', rate=3, burst=7)
+    bucket = limiter.bucket('http://node/', rate=25)
+    assert (bucket.rate, bucket.burst) == (3, 7)
+    assert limiter.bucket('http://other/', rate=0) is None
+
+
+def test_explorer_get_retries_once_on_a_rate_limited_body():
+    calls = []
+
+    async def handler(request):
+        calls.append(dict(request.query))
+        if len(calls) == 1:
+            return web.json_response({'status': '0', 'message': 'NOTOK', 'result': 'Max rate limit reached'})
+        return web.json_response({'status': '1', 'message': 'OK', 'result': '42'})
+
+    async def run():
+        app = web.Application()
+        app.router.add_get('/api', handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        api = API(key='key', url=f'http://127.0.0.1:{port}/api', docs='', rps=50)
+        try:
+            return await api.get(module='account', action='balance')
+        finally:
+            await session_pool.sessions.pop(api.url).close()
+            await runner.cleanup()
+
+    assert asyncio.run(run())['result'] == '42'
+    assert len(calls) == 2
+    assert calls[0] == {'module': 'account', 'action': 'balance', 'apikey': 'key'}
@@ -0,0 +1,86 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from sdk.tokens import TokenRegistry
+
+TOKEN = '0xaf88d065e77c8cC2239327C5EDb3A432268e5831'
+
+
+class Eth:
+    @property
+    async def block_number(self) -> int:
+        return 1
+
+
+@pytest.fixture
+def registry(tmp_path):
+    return TokenRegistry(path=str(tmp_path / 'tokens.json'), max_size=2, flush_interval=0.01)
+
+
+def test_get_is_case_insensitive_and_merges_metadata(registry):
+    registry.set(1, TOKEN.lower(), save=False, decimals=6)
+    registry.set(1, TOKEN, save=False, symbol='USDC')
+    assert registry.get(1, TOKEN.upper().replace('0X', '0x')) == {'decimals': 6, 'symbol': 'USDC'}
+
+
+def test_memory_is_bounded_but_disk_keeps_everything(registry):
+    for i in range(5):
+        registry.set(1, '0x' + f'{i:040x}', save=False, decimals=i)
+    assert len(registry.memory) == 2
+    assert registry.get(1, '0x' + f'{0:040x}') == {'decimals': 0}
+
+
+def test_many_sets_are_written_once(registry, monkeypatch):
+    saves = []
+    save = registry.save
+    monkeypatch.setattr(registry, 'save', lambda: saves.append(save()))
+
+    async def main():
+        for i in range(100):
+            registry.set(1, '0x' + f'{i:040x}', decimals=18)
+        await asyncio.sleep(0.05)
+
+    asyncio.run(main())
+    assert len(saves) == 1
+    with open(registry.path) as file:
+        assert len(json.load(file)) == 100
+
+
+def test_flush_is_rescheduled_on_a_new_loop(registry):
+    async def mark():
+        registry.flush_interval = 60
+        registry.set(1, TOKEN, decimals=6)
+
+    async def mark_and_wait():
+        registry.flush_interval = 0.01
+        registry.set(1, TOKEN, symbol='USDC')
+        await asyncio.sleep(0.05)
+
+    asyncio.run(mark())
+    asyncio.run(mark_and_wait())
+    assert not registry.dirty
+    assert TokenRegistry(path=registry.path).get(1, TOKEN) == {'decimals': 6, 'symbol': 'USDC'}
+
+
+def test_warm_reads_only_missing_tokens(registry):
+    calls = []
+
+    async def decimals(tokens, block=None):
+        calls.append(tuple(tokens))
+        return {token: 6 for token in tokens}
+
+    async def symbols(tokens, block=None):
+        return {token: 'USDC' for token in tokens}
+
+    client = SimpleNamespace(
+        network=SimpleNamespace(chain_id=1), w3=SimpleNamespace(eth=Eth()),
+        multicall=SimpleNamespace(decimals=decimals, symbols=symbols)
+    )
+    other = '0x' + '11' * 20
+    registry.set(1, TOKEN, save=False, decimals=6, symbol='USDC')
+    asyncio.run(registry.warm(client, [TOKEN, other]))
+    assert calls == [(other,)]
+    assert registry.get(1, other) == {'decimals': 6, 'symbol': 'USDC'}
@@ -23,3 +23,7 @@ class Contracts(Singleton):
     ARBITRUM_WBTC = RawContract(
         address='0x2f2a2543B76A4166549F7aaB2e75Bef0aefC5B0f', abi=DefaultABIs.Token
     )
+
+    MULTICALL3 = RawContract(
+        address='0xcA11bde05977b3631167028862bE2a173976CA11', abi=read_json(path=(ABIS_DIR, 'multicall3.json'))
+    )
@@ -1,11 +1,13 @@
 import asyncio
 from typing import Optional
 
-import aiohttp
 from py_eth_async.client import Client
 from py_eth_async.data.models import TokenAmount
+from web3 import Web3
 
 from data.config import logger
+from utils.multicall import Multicall
+from utils.prices import price_service
 
 
 class Base:
@@ -20,7 +22,15 @@ class Base:
         logger.info(
             f'{self.client.account.address} | start approve token_address: {token_address} for spender: {spender}'
         )
-        balance = await self.client.wallet.balance(token=token_address)
+        owner = self.client.account.address
+        multicall = Multicall(client=self.client)
+        block = await self.client.w3.eth.block_number
+        balances, allowances = await asyncio.gather(
+            multicall.balances([(owner, token_address)], block=block),
+            multicall.allowances([(owner, token_address, spender)], block=block)
+        )
+        key = tuple(Web3.to_checksum_address(address) for address in (owner, token_address, spender))
+        balance = balances.get(key[:2]) or await self.client.wallet.balance(token=token_address)
         if balance.Wei <= 0:
             logger.error(f'{self.client.account.address} | approve | zero balance')
             return False
@@ -28,7 +38,7 @@ class Base:
         if not amount or amount.Wei > balance.Wei:
             amount = balance
 
-        approved_amount = await self.client.transactions.approved_amount(
+        approved_amount = allowances.get(key) or await self.client.transactions.approved_amount(
             token=token_address,
             spender=spender
         )
@@ -44,25 +54,5 @@ class Base:
             return True
         return False
 
-    async def get_token_price(self, token='ETH', retries: int = 5):
-        token = token.upper()
-        for _ in range(retries):
-            try:
-                async with aiohttp.ClientSession() as session:
-                    logger.info(
-                        f'{self.client.account.address} | getting {token} price')
-                    async with session.get(f'https://api.binance.com/api/v3/depth?limit=1&symbol={token}USDT') as r:
-                        if r.status != 200:
-                            logger.error(f'code: {r.status} | json: {r.json()}')
-                            exit()
-                        result_dict = await r.json()
-                        if 'asks' not in result_dict:
-                            logger.error(
-                                f'code: {r.status} | json: {r.json()}')
-                            exit()
-                        return float(result_dict['asks'][0][0])
-            except Exception as e:
-                logger.error(
-                    f'{self.client.account.address} | getting {token} price: {e}')
-                await asyncio.sleep(5)
-        exit()
+    async def get_token_price(self, token='ETH') -> float:
+        return await price_service.price(token=token)
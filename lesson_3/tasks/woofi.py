@@ -1,4 +1,3 @@
-import asyncio
 from typing import Optional
 from web3.types import TxParams
 from py_eth_async.data.models import TxArgs, TokenAmount
@@ -52,8 +51,8 @@ class WooFi(Base):
         if not amount:
             amount = await self.client.wallet.balance(token=from_token)
 
-        await self.approve_interface(token_address=from_token.address, spender=contract.address, amount=amount)
-        await asyncio.sleep(5)
+        if not await self.approve_interface(token_address=from_token.address, spender=contract.address, amount=amount):
+            return f'{failed_text}: can not approve'
 
         eth_price = await self.get_token_price(token='ETH')
         min_to_amount = TokenAmount(
@@ -123,8 +122,8 @@ class WooFi(Base):
         if not amount:
             amount = await self.client.wallet.balance(token=from_token)
 
-        await self.approve_interface(token_address=from_token.address, spender=contract.address, amount=amount)
-        await asyncio.sleep(5)
+        if not await self.approve_interface(token_address=from_token.address, spender=contract.address, amount=amount):
+            return f'{failed_text}: can not approve'
 
         eth_price = await self.get_token_price(token='ETH')
         min_to_amount = TokenAmount(
@@ -195,8 +194,8 @@ class WooFi(Base):
         if not amount:
             amount = await self.client.wallet.balance(token=from_token)
 
-        await self.approve_interface(token_address=from_token.address, spender=contract.address, amount=amount)
-        await asyncio.sleep(5)
+        if not await self.approve_interface(token_address=from_token.address, spender=contract.address, amount=amount):
+            return f'{failed_text}: can not approve'
 
         eth_price = await self.get_token_price(token='ETH')
         btc_price = await self.get_token_price(token='BTC')
@@ -285,8 +284,8 @@ class WooFi(Base):
         if not amount:
             amount = await self.client.wallet.balance(token=from_token)
 
-        await self.approve_interface(token_address=from_token.address, spender=contract.address, amount=amount)
-        await asyncio.sleep(5)
+        if not await self.approve_interface(token_address=from_token.address, spender=contract.address, amount=amount):
+            return f'{failed_text}: can not approve'
 
         eth_price = await self.get_token_price(token='ETH')
         if token_ticker.upper() == 'USDT':
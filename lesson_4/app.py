@@ -8,11 +8,15 @@ from data.models import Contracts
 from tasks.stargate import Stargate
 from private_data import private_key1
 from tasks.woofi import WooFi
+from utils.tokens import token_registry
 
 
 async def main():
     client = Client(private_key=private_key1, network=Networks.Avalanche)
     stargate = Stargate(client=client)
+    await token_registry.warm(
+        client=client, addresses=[Stargate.contract_data[client.network.name]['usdc_contract'].address]
+    )
 
     # status = await stargate.send_usdc(
     #     to_network_name=Networks.Polygon.name,
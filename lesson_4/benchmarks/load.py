@@ -0,0 +1,158 @@
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from collections import Counter
+from typing import Awaitable, Callable, Dict, List
+
+from eth_account import Account
+from py_eth_async.client import Client
+from py_eth_async.data.models import Network, Networks, TokenAmount
+
+from data.models import Contracts
+from mocks.rpc_node import RPCNode
+from tasks.base import Base
+from tasks.stargate import Stargate
+from tasks.woofi import WooFi
+from utils.allowances import allowance_cache
+from utils.prices import price_service
+from utils.receipts import receipt_watcher
+from utils.tokens import token_registry
+
+
+async def balance(client: Client):
+    return await asyncio.gather(
+        client.wallet.balance(),
+        client.wallet.balance(token=Contracts.ARBITRUM_USDC.address)
+    )
+
+
+async def approve(client: Client):
+    return await Base(client=client).approve_interface(
+        token_address=Contracts.ARBITRUM_USDC.address,
+        spender=Contracts.ARBITRUM_WOOFI.address,
+        amount=TokenAmount(1, decimals=6)
+    )
+
+
+async def swap(client: Client):
+    return await WooFi(client=client).swap(
+        from_token=Contracts.ARBITRUM_USDC,
+        to_token=Contracts.ARBITRUM_ETH,
+        amount=TokenAmount(1, decimals=6)
+    )
+
+
+async def bridge(client: Client):
+    return await Stargate(client=client).send_usdc(
+        to_network_name=Networks.Polygon.name,
+        amount=TokenAmount(1, decimals=6),
+        max_fee=100
+    )
+
+
+scenarios: Dict[str, Callable[[Client], Awaitable]] = {
+    'balance': balance,
+    'approve': approve,
+    'swap': swap,
+    'bridge': bridge,
+}
+
+
+def percentile(values: List[float], q: float) -> float:
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+async def run_scenario(name: str, clients: List[Client], concurrency: int) -> Dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = Counter()
+
+    async def run(client: Client) -> None:
+        async with semaphore:
+            started_at = time.perf_counter()
+            try:
+                result = await scenarios[name](client)
+                if result is False or (isinstance(result, str) and 'Failed' in result):
+                    errors[str(result).split(':')[0][:60]] += 1
+            except Exception as e:
+                errors[f'{type(e).__name__}: {str(e)[:60]}'] += 1
+            latencies.append(time.perf_counter() - started_at)
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*[run(client) for client in clients])
+    elapsed = time.perf_counter() - started_at
+
+    latencies.sort()
+    return {
+        'ops': len(latencies),
+        'errors': errors,
+        'throughput': len(latencies) / elapsed,
+        'p50': statistics.median(latencies),
+        'p95': percentile(latencies, 0.95),
+        'p99': percentile(latencies, 0.99),
+        'max': latencies[-1],
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description='Load test tasks against a local mock JSON-RPC node',
+        epilog='run from lesson_4 as a module: python -m benchmarks.load -w 200 -c 50'
+    )
+    parser.add_argument('-w', '--wallets', type=int, default=100)
+    parser.add_argument('-c', '--concurrency', type=int, default=50)
+    parser.add_argument('-s', '--scenarios', default=','.join(scenarios))
+    parser.add_argument('--latency', type=float, default=0.05, help='mock node latency, s')
+    parser.add_argument('--jitter', type=float, default=0.02, help='mock node latency jitter, s')
+    parser.add_argument('--error-rate', type=float, default=0, help='share of JSON-RPC calls answered with an error')
+    parser.add_argument('--rate-limit-rate', type=float, default=0, help='share of HTTP requests answered with 429')
+    parser.add_argument('--block-time', type=float, default=0.25, help='mock node block time, s')
+    parser.add_argument('--port', type=int, default=8545)
+    args = parser.parse_args()
+
+    files_dir = tempfile.mkdtemp()
+    allowance_cache.path = os.path.join(files_dir, 'allowances.json')
+    token_registry.path = os.path.join(files_dir, 'tokens.json')
+    receipt_watcher.poll_interval = args.block_time / 2
+    price_service.ttl = float('inf')
+    for token, price in {'ETH': 2000, 'MATIC': 0.6, 'AVAX': 12, 'BNB': 230}.items():
+        price_service.save(token, price)
+
+    node = RPCNode(
+        latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate, block_time=args.block_time
+    )
+    url = await node.start(port=args.port)
+    network = Network(name=Networks.Arbitrum.name, rpc=url, chain_id=node.chain_id, tx_type=2, coin_symbol='ETH')
+    clients = [Client(private_key=Account.create().key.hex(), network=network) for _ in range(args.wallets)]
+
+    print(f'{args.wallets} wallets | concurrency {args.concurrency} | latency {args.latency * 1000:.0f}'
+          f'±{args.jitter * 1000:.0f} ms | errors {args.error_rate:.1%} | 429 {args.rate_limit_rate:.1%}')
+    print(f'{"scenario":<10} {"ops":>6} {"errors":>7} {"ops/s":>8} ' + ' '.join(
+        f'{column:>8}' for column in ('p50 ms', 'p95 ms', 'p99 ms', 'max ms')
+    ))
+    try:
+        for name in args.scenarios.split(','):
+            report = await run_scenario(name=name, clients=clients, concurrency=args.concurrency)
+            print(
+                f'{name:<10} {report["ops"]:>6} {sum(report["errors"].values()):>7} {report["throughput"]:>8.1f} '
+                + ' '.join(f'{report[key] * 1000:>8.0f}' for key in ('p50', 'p95', 'p99', 'max'))
+            )
+            for error, count in report['errors'].most_common(3):
+                print(f'{"":<10} {count:>6} x {error}')
+
+        print(f'receipts: {receipt_watcher.stats(node.chain_id)}')
+        print(f'mock node: {dict(node.stats.most_common())}')
+    finally:
+        allowance_cache.flush()
+        token_registry.flush()
+        await price_service.close()
+        await node.stop()
+
+
+if __name__ == '__main__':
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(main())
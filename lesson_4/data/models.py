@@ -45,3 +45,7 @@ class Contracts(Singleton):
     AVALANCHE_USDC = RawContract(
         address='0xB97EF9Ef8734C71904D8002F8b6Bc66Dd9c48a6E', abi=read_json(path=(ABIS_DIR, 'stargate.json'))
     )
+
+    MULTICALL3 = RawContract(
+        address='0xcA11bde05977b3631167028862bE2a173976CA11', abi=read_json(path=(ABIS_DIR, 'multicall3.json'))
+    )
@@ -0,0 +1,86 @@
+import asyncio
+import json
+import random
+from typing import Dict, Optional, Set
+
+from aiohttp import web
+
+
+class PriceStream:
+    def __init__(self, prices: Dict[str, float], interval: float = 0.1, volatility: float = 0.001) -> None:
+        self.prices = {token.upper(): price for token, price in prices.items()}
+        self.interval = interval
+        self.volatility = volatility
+        self.clients: Set[web.WebSocketResponse] = set()
+        self.runner: Optional[web.AppRunner] = None
+        self.task: Optional[asyncio.Task] = None
+
+    async def handle(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        ws.tokens = {
+            stream.split('usdt@')[0].upper() for stream in request.query.get('streams', '').split('/') if stream
+        }
+        self.clients.add(ws)
+        try:
+            async for _ in ws:
+                pass
+        finally:
+            self.clients.discard(ws)
+        return ws
+
+    def message(self, token: str) -> str:
+        price = self.prices[token]
+        return json.dumps({
+            'stream': f'{token.lower()}usdt@bookTicker',
+            'data': {
+                's': f'{token}USDT',
+                'b': f'{price * (1 - self.volatility / 10):.8f}', 'B': '1',
+                'a': f'{price:.8f}', 'A': '1'
+            }
+        })
+
+    async def publish(self, token: str) -> None:
+        message = self.message(token)
+        for ws in list(self.clients):
+            if token in ws.tokens and not ws.closed:
+                await ws.send_str(message)
+
+    async def set_price(self, token: str, price: float) -> None:
+        self.prices[token.upper()] = price
+        await self.publish(token.upper())
+
+    async def tick(self) -> None:
+        while True:
+            for token in self.prices:
+                self.prices[token] *= 1 + random.uniform(-self.volatility, self.volatility)
+                await self.publish(token)
+            await asyncio.sleep(self.interval)
+
+    async def start(self, host: str = '127.0.0.1', port: int = 9443) -> str:
+        app = web.Application()
+        app.router.add_get('/stream', self.handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, host, port).start()
+        self.task = asyncio.ensure_future(self.tick())
+        return f'http://{host}:{port}/stream'
+
+    async def stop(self) -> None:
+        if self.task:
+            self.task.cancel()
+        for ws in list(self.clients):
+            await ws.close()
+        if self.runner:
+            await self.runner.cleanup()
+
+
+if __name__ == '__main__':
+    async def main():
+        stream = PriceStream(prices={'ETH': 2000, 'BTC': 30000, 'AVAX': 12, 'MATIC': 0.6, 'BNB': 230})
+        url = await stream.start()
+        print(f'price stream: {url}')
+        await asyncio.Event().wait()
+
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(main())
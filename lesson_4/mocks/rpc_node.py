@@ -0,0 +1,163 @@
+import asyncio
+import random
+import time
+from collections import Counter
+from typing import Optional
+
+from aiohttp import web
+from eth_abi import decode, encode
+from web3 import Web3
+
+
+def selector(signature: str) -> bytes:
+    return Web3.keccak(text=signature)[:4]
+
+
+class RPCNode:
+    class Selectors:
+        aggregate3 = selector('aggregate3((address,bool,bytes)[])')
+        getEthBalance = selector('getEthBalance(address)')
+        balanceOf = selector('balanceOf(address)')
+        allowance = selector('allowance(address,address)')
+        decimals = selector('decimals()')
+        symbol = selector('symbol()')
+        querySwap = selector('querySwap(address,address,uint256)')
+        quoteLayerZeroFee = selector('quoteLayerZeroFee(uint16,uint8,bytes,bytes,(uint256,uint256,bytes))')
+
+    def __init__(self, chain_id: int = 42161, latency: float = 0.05, jitter: float = 0.02, error_rate: float = 0,
+                 rate_limit_rate: float = 0, block_time: float = 0.25, inclusion_blocks: int = 1) -> None:
+        self.chain_id = chain_id
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.block_time = block_time
+        self.inclusion_blocks = inclusion_blocks
+        self.started_at = time.monotonic()
+        self.transactions = {}
+        self.stats = Counter()
+        self.runner: Optional[web.AppRunner] = None
+
+    @property
+    def block_number(self) -> int:
+        return 1_000_000 + int((time.monotonic() - self.started_at) / self.block_time)
+
+    def call(self, data: bytes) -> bytes:
+        method, args = data[:4], data[4:]
+        if method == self.Selectors.aggregate3:
+            calls = decode(['(address,bool,bytes)[]'], args)[0]
+            return encode(['(bool,bytes)[]'], [[(True, self.call(call_data)) for target, allow, call_data in calls]])
+        if method == self.Selectors.getEthBalance:
+            return encode(['uint256'], [10 * 10 ** 18])
+        if method == self.Selectors.balanceOf:
+            return encode(['uint256'], [1_000 * 10 ** 6])
+        if method == self.Selectors.decimals:
+            return encode(['uint256'], [6])
+        if method == self.Selectors.symbol:
+            return encode(['string'], ['USDC'])
+        if method == self.Selectors.querySwap:
+            return encode(['uint256'], [decode(['address', 'address', 'uint256'], args)[2] * 99 // 100])
+        if method == self.Selectors.quoteLayerZeroFee:
+            return encode(['uint256', 'uint256'], [10 ** 14, 0])
+        return encode(['uint256'], [0])
+
+    def receipt(self, tx_hash: str) -> Optional[dict]:
+        block = self.transactions.get(tx_hash)
+        if block is None or block > self.block_number:
+            return None
+        return {
+            'transactionHash': tx_hash, 'transactionIndex': '0x0', 'blockNumber': hex(block),
+            'blockHash': '0x' + block.to_bytes(32, 'big').hex(),
+            'status': '0x1', 'gasUsed': hex(150_000), 'cumulativeGasUsed': hex(150_000),
+            'effectiveGasPrice': hex(10 ** 8), 'logs': [], 'logsBloom': '0x' + '00' * 256, 'type': '0x2',
+            'contractAddress': None,
+        }
+
+    def result(self, method: str, params: list):
+        if method == 'eth_chainId':
+            return hex(self.chain_id)
+        if method == 'net_version':
+            return str(self.chain_id)
+        if method == 'eth_blockNumber':
+            return hex(self.block_number)
+        if method == 'eth_getBalance':
+            return hex(10 * 10 ** 18)
+        if method == 'eth_getTransactionCount':
+            return '0x0'
+        if method in ('eth_gasPrice', 'eth_maxPriorityFeePerGas'):
+            return hex(10 ** 8)
+        if method == 'eth_estimateGas':
+            return hex(150_000)
+        if method == 'eth_call':
+            return '0x' + self.call(bytes.fromhex(params[0].get('data', params[0].get('input', '0x'))[2:])).hex()
+        if method == 'eth_feeHistory':
+            count = int(params[0], 16) if isinstance(params[0], str) else params[0]
+            return {
+                'oldestBlock': hex(self.block_number - count + 1),
+                'baseFeePerGas': [hex(10 ** 8)] * (count + 1),
+                'gasUsedRatio': [0.5] * count,
+                'reward': [[hex(10 ** 6) for _ in params[2]] for _ in range(count)],
+            }
+        if method == 'eth_getBlockByNumber':
+            return {
+                'number': hex(self.block_number), 'baseFeePerGas': hex(10 ** 8), 'gasLimit': hex(30_000_000),
+                'gasUsed': hex(15_000_000), 'timestamp': hex(int(time.time())), 'transactions': [],
+            }
+        if method == 'eth_sendRawTransaction':
+            tx_hash = '0x' + bytes(Web3.keccak(hexstr=params[0])).hex()
+            self.transactions[tx_hash] = self.block_number + self.inclusion_blocks
+            return tx_hash
+        if method == 'eth_getTransactionReceipt':
+            return self.receipt(params[0].lower())
+        if method == 'eth_getLogs':
+            return []
+        raise NotImplementedError(method)
+
+    def respond(self, request: dict) -> dict:
+        self.stats[request.get('method')] += 1
+        response = {'jsonrpc': '2.0', 'id': request.get('id')}
+        if random.random() < self.error_rate:
+            self.stats['injected_errors'] += 1
+            response['error'] = {'code': -32000, 'message': 'mock node: injected error'}
+            return response
+
+        try:
+            response['result'] = self.result(request['method'], request.get('params', []))
+        except NotImplementedError:
+            response['error'] = {'code': -32601, 'message': f'mock node: method {request["method"]} not supported'}
+        return response
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.stats['http_requests'] += 1
+        await asyncio.sleep(max(self.latency + random.uniform(-self.jitter, self.jitter), 0))
+        if random.random() < self.rate_limit_rate:
+            self.stats['rate_limited'] += 1
+            return web.json_response({'error': 'rate limited'}, status=429, headers={'Retry-After': '1'})
+
+        body = await request.json()
+        if isinstance(body, list):
+            return web.json_response([self.respond(item) for item in body])
+        return web.json_response(self.respond(body))
+
+    async def start(self, host: str = '127.0.0.1', port: int = 8545) -> str:
+        app = web.Application()
+        app.router.add_post('/', self.handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, host, port).start()
+        return f'http://{host}:{port}/'
+
+    async def stop(self) -> None:
+        if self.runner:
+            await self.runner.cleanup()
+
+
+if __name__ == '__main__':
+    async def main():
+        node = RPCNode()
+        url = await node.start()
+        print(f'mock node: {url}')
+        await asyncio.Event().wait()
+
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(main())
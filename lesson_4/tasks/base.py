@@ -1,26 +1,117 @@
 import asyncio
-from typing import Optional
+import time
+from typing import Any, Awaitable, Dict, List, Optional, Tuple, Union
 
-import aiohttp
 from py_eth_async.client import Client
 from py_eth_async.data.models import TokenAmount
+from py_eth_async.transactions import Tx
+from web3 import Web3
+from web3.types import TxParams
 
 from data.config import logger
+from data.models import Contracts
+from utils.allowances import allowance_cache
+from utils.gas import gas_oracle
+from utils.multicall import Multicall
+from utils.nonce import nonce_manager
+from utils.prices import price_service
+from utils.receipts import receipt_watcher
+from utils.tokens import token_registry
 
 
 class Base:
+    pipelined_gas_limit = 3_000_000
+    gas_strategy = 'standard'
+
     def __init__(self, client: Client):
         self.client = client
+        self.multicall = Multicall(client=client)
 
     async def get_decimals(self, contract_address: str) -> int:
+        if contract_address.lower() == Contracts.ARBITRUM_ETH.address.lower():
+            return 18
+        return await token_registry.decimals(client=self.client, address=contract_address)
+
+    async def get_symbol(self, contract_address: str) -> str:
+        if contract_address.lower() == Contracts.ARBITRUM_ETH.address.lower():
+            return self.client.network.coin_symbol
+        return await token_registry.symbol(client=self.client, address=contract_address)
+
+    async def get_balance(self, contract_address: Optional[str] = None) -> TokenAmount:
+        if not contract_address or contract_address.lower() == Contracts.ARBITRUM_ETH.address.lower():
+            return await self.client.wallet.balance()
+
         contract = await self.client.contracts.default_token(contract_address=contract_address)
-        return await contract.functions.decimals().call()
+        amount, decimals = await asyncio.gather(
+            contract.functions.balanceOf(self.client.account.address).call(),
+            self.get_decimals(contract_address=contract_address)
+        )
+        return TokenAmount(amount=amount, decimals=decimals, wei=True)
+
+    async def approved_amounts(self, tokens_spenders: List[Tuple[str, str]]) -> Dict[Tuple[str, str], TokenAmount]:
+        owner = self.client.account.address
+        allowances = await allowance_cache.read(
+            client=self.client, keys=[(owner, token, spender) for token, spender in tokens_spenders]
+        )
+        return {
+            (token, spender): TokenAmount(amount=amount, wei=True)
+            for (owner, token, spender), amount in allowances.items() if amount is not None
+        }
+
+    async def prefetch(self, **reads: Awaitable) -> Tuple[Dict[str, Any], Dict[str, float]]:
+        timings = {}
 
-    async def approve_interface(self, token_address: str, spender: str, amount: Optional[TokenAmount] = None) -> bool:
+        async def timed(name: str, read: Awaitable) -> Any:
+            started_at = time.perf_counter()
+            try:
+                return await read
+            finally:
+                timings[name] = time.perf_counter() - started_at
+
+        results = await asyncio.gather(*[timed(name, read) for name, read in reads.items()])
+        return dict(zip(reads, results)), timings
+
+    async def send(self, tx_params: TxParams) -> Tx:
+        if 'gasPrice' not in tx_params and 'maxFeePerGas' not in tx_params:
+            tx_params.update(await gas_oracle.suggest(client=self.client, strategy=self.gas_strategy))
+        tx_params['nonce'] = nonce = await nonce_manager.reserve(client=self.client)
+        try:
+            tx = await self.client.transactions.sign_and_send(tx_params=tx_params)
+        except Exception as err:
+            await nonce_manager.release(client=self.client, nonce=nonce)
+            if nonce_manager.nonce_error(err):
+                await nonce_manager.resync(client=self.client)
+            raise
+        await nonce_manager.sent(client=self.client, nonce=nonce)
+        return tx
+
+    async def approve_interface(self, token_address: str, spender: str, amount: Optional[TokenAmount] = None,
+                                balance: Optional[TokenAmount] = None, approved_amount: Optional[TokenAmount] = None,
+                                wait: bool = True) -> Union[bool, Tx]:
         logger.info(
             f'{self.client.account.address} | start approve token_address: {token_address} for spender: {spender}'
         )
-        balance = await self.client.wallet.balance(token=token_address)
+        owner = self.client.account.address
+        if balance and balance.Wei <= 0:
+            logger.error(f'{self.client.account.address} | approve | zero balance')
+            return False
+
+        if approved_amount:
+            approved = approved_amount.Wei
+        else:
+            approved = allowance_cache.get(self.client.network.chain_id, owner, token_address, spender)
+
+        if approved is None:
+            key = tuple(Web3.to_checksum_address(address) for address in (owner, token_address, spender))
+            reads = {'allowances': allowance_cache.read(client=self.client, keys=[key])}
+            if not balance:
+                reads['balances'] = self.multicall.balances([key[:2]])
+            prefetched, timings = await self.prefetch(**reads)
+            balance = balance or prefetched.get('balances', {}).get(key[:2])
+            approved = prefetched['allowances'].get(key) or 0
+        if not balance:
+            balance = await self.get_balance(contract_address=token_address)
+
         if balance.Wei <= 0:
             logger.error(f'{self.client.account.address} | approve | zero balance')
             return False
@@ -28,41 +119,75 @@ class Base:
         if not amount or amount.Wei > balance.Wei:
             amount = balance
 
-        approved_amount = await self.client.transactions.approved_amount(
-            token=token_address,
-            spender=spender
-        )
-        if amount.Wei <= approved_amount.Wei:
-            return True
-        tx = await self.client.transactions.approve(
-            token=token_address,
-            spender=spender,
-            amount=amount.Wei
-        )
-        receipt = await tx.wait_for_receipt(client=self.client, timeout=200)
-        if receipt:
+        if amount.Wei <= approved:
             return True
-        return False
+        return await self.approve(token_address=token_address, spender=spender, amount=amount.Wei, wait=wait)
 
-    async def get_token_price(self, token='ETH', retries: int = 5):
-        token = token.upper()
-        for _ in range(retries):
-            try:
-                async with aiohttp.ClientSession() as session:
-                    logger.info(
-                        f'{self.client.account.address} | getting {token} price')
-                    async with session.get(f'https://api.binance.com/api/v3/depth?limit=1&symbol={token}USDT') as r:
-                        if r.status != 200:
-                            logger.error(f'code: {r.status} | json: {r.json()}')
-                            exit()
-                        result_dict = await r.json()
-                        if 'asks' not in result_dict:
-                            logger.error(
-                                f'code: {r.status} | json: {r.json()}')
-                            exit()
-                        return float(result_dict['asks'][0][0])
-            except Exception as e:
-                logger.error(
-                    f'{self.client.account.address} | getting {token} price: {e}')
-                await asyncio.sleep(5)
-        exit()
+    async def approve(self, token_address: str, spender: str, amount: int, wait: bool = True) -> Union[bool, Tx]:
+        token_contract = await self.client.contracts.default_token(contract_address=token_address)
+        tx = await self.send(tx_params=TxParams(
+            to=token_contract.address,
+            data=token_contract.encodeABI('approve', args=(spender, amount))
+        ))
+        key = self.client.network.chain_id, self.client.account.address, token_address, spender
+        confirmation = allowance_cache.set_unconfirmed(*key, amount=amount, confirmation=self.confirmed(tx))
+        if not wait:
+            return tx
+        return await confirmation
+
+    def spent(self, token_address: str, spender: str, amount: TokenAmount, success: bool) -> None:
+        key = self.client.network.chain_id, self.client.account.address, token_address, spender
+        if success:
+            allowance_cache.spend(*key, amount=amount.Wei)
+        else:
+            allowance_cache.forget(*key)
+
+    @staticmethod
+    async def pre_approve(clients: List[Client], tokens_spenders: List[Tuple[str, str]],
+                          unlimited: bool = True) -> Dict[Tuple[str, str, str], bool]:
+        results = {}
+        networks = {}
+        for client in clients:
+            networks.setdefault(client.network.chain_id, []).append(client)
+
+        for network_clients in networks.values():
+            client = network_clients[0]
+            owners = {network_client.account.address: network_client for network_client in network_clients}
+            keys = [(owner, token, spender) for owner in owners for token, spender in tokens_spenders]
+            await allowance_cache.sync(client=client, owners=list(owners))
+            allowances, balances = await asyncio.gather(
+                allowance_cache.read(client=client, keys=keys),
+                Multicall(client=client).balances(list(dict.fromkeys((owner, token) for owner, token, spender in keys)))
+            )
+
+            approvals = []
+            for key, allowance in allowances.items():
+                owner, token, spender = key
+                balance = balances.get((owner, token))
+                if not balance or balance.Wei <= 0 or allowance is None or allowance >= balance.Wei:
+                    results[key] = bool(balance and balance.Wei > 0 and allowance is not None)
+                    continue
+                approvals.append((key, Base(client=owners[owner]).approve(
+                    token_address=token,
+                    spender=spender,
+                    amount=allowance_cache.unlimited if unlimited else balance.Wei
+                )))
+
+            logger.info(f'{client.network.name} | pre-approve | {len(approvals)} of {len(keys)} approvals needed')
+            statuses = await asyncio.gather(*[approval for key, approval in approvals], return_exceptions=True)
+            for (key, approval), status in zip(approvals, statuses):
+                if isinstance(status, Exception):
+                    logger.error(f'{key[0]} | pre-approve | {key[1]} for {key[2]}: {status}')
+                results[key] = status is True
+
+        return results
+
+    async def confirmed(self, tx: Union[bool, Tx], timeout: float = 200) -> bool:
+        if isinstance(tx, bool):
+            return tx
+
+        receipt = await receipt_watcher.wait(client=self.client, tx_hash=tx.hash, timeout=timeout)
+        return bool(receipt) and receipt.get('status', 1) == 1
+
+    async def get_token_price(self, token='ETH') -> float:
+        return await price_service.price(token=token)
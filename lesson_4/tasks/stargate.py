@@ -15,20 +15,44 @@ avalanche -> bsc (2.5 USDT): https://snowtrace.io/tx/0x47d2cfa1d89b1656c83c5548e
 '''
 
 import asyncio
-import random
-from typing import Optional
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
 from web3.types import TxParams
 from web3.contract import AsyncContract
 
 from tasks.base import Base
 from py_eth_async.data.models import TxArgs, TokenAmount
 from py_eth_async.data.models import Networks
+from py_eth_async.client import Client
 
 from data.config import logger
 from data.models import Contracts
+from utils.allowances import allowance_cache
+from utils.amounts import min_amount
+from utils.gas import gas_oracle
+from utils.lz_fees import layer_zero_fees
+from utils.multicall import Multicall
+from utils.prices import PriceError, price_service
+
+
+@dataclass
+class Bridge:
+    address: str
+    from_network_name: str
+    to_network_name: str
+    amount: TokenAmount
+    fee: TokenAmount
+    fee_usd: float
 
 
 class Stargate(Base):
+    approve_gas_limit = 60_000
+    swap_gas_limit = 600_000
+
+    networks = {
+        network.name: network for network in (Networks.Arbitrum, Networks.Avalanche, Networks.Polygon, Networks.BSC)
+    }
+
     contract_data = {
         Networks.Arbitrum.name: {
             'usdc_contract': Contracts.ARBITRUM_USDC_e,
@@ -94,7 +118,7 @@ class Stargate(Base):
             _dstPoolId=Stargate.contract_data[to_network_name]['dst_pool_id'],
             _refundAddress=self.client.account.address,
             _amountLD=amount.Wei,
-            _minAmountLD=int(amount.Wei * (100 - slippage) / 100),
+            _minAmountLD=min_amount(amount=amount.Wei, slippage=slippage),
             _lzTxParams=lz_tx_params.tuple(),
             _to=self.client.account.address,
             _payload='0x'
@@ -117,13 +141,11 @@ class Stargate(Base):
         if network_fee > max_fee:
             return f'{failed_text} | too high fee: {network_fee} ({self.client.network.name})'
 
-        if await self.approve_interface(
+        if not await self.approve_interface(
                 token_address=usdc_contract.address,
                 spender=stargate_contract.address,
                 amount=amount
         ):
-            await asyncio.sleep(random.randint(5, 10))
-        else:
             return f'{failed_text} | can not approve'
 
         tx_params = TxParams(
@@ -132,8 +154,11 @@ class Stargate(Base):
             value=value.Wei
         )
 
-        tx = await self.client.transactions.sign_and_send(tx_params=tx_params)
-        receipt = await tx.wait_for_receipt(client=self.client, timeout=300)
+        tx = await self.send(tx_params=tx_params)
+        receipt = await self.confirmed(tx, timeout=300)
+        self.spent(
+            token_address=usdc_contract.address, spender=stargate_contract.address, amount=amount, success=receipt
+        )
         if receipt:
             return f'{amount.Ether} USDC was send from {self.client.network.name} to {to_network_name} via Stargate: {tx.hash.hex()}'
         return f'{failed_text}!'
@@ -142,15 +167,56 @@ class Stargate(Base):
         #     return f'{failed_text}: {e}'
 
     async def get_value(self, router_contract: AsyncContract, to_network_name: str,
-                        lz_tx_params: TxArgs) -> Optional[TokenAmount]:
-        res = await router_contract.functions.quoteLayerZeroFee(
-            Stargate.contract_data[to_network_name]['stargate_chain_id'],
-            1,
-            self.client.account.address,
-            '0x',
-            lz_tx_params.list()
-        ).call()
-        return TokenAmount(amount=res[0], wei=True)
+                        lz_tx_params: TxArgs, function_type: int = 1) -> Optional[TokenAmount]:
+        return await layer_zero_fees.quote(
+            router_contract=router_contract,
+            src_network_name=self.client.network.name,
+            dst_chain_id=Stargate.contract_data[to_network_name]['stargate_chain_id'],
+            to_address=self.client.account.address,
+            lz_tx_params=lz_tx_params,
+            function_type=function_type
+        )
+
+    @staticmethod
+    async def quote_matrix(
+            lz_tx_params: Optional[TxArgs] = None,
+            function_type: int = 1
+    ) -> Dict[Tuple[str, str], Optional[TokenAmount]]:
+        if not lz_tx_params:
+            lz_tx_params = TxArgs(
+                dstGasForCall=0,
+                dstNativeAmount=0,
+                dstNativeAddr='0x0000000000000000000000000000000000000001'
+            )
+
+        routes = [
+            (src_network_name, dst_network_name)
+            for src_network_name, src_data in Stargate.contract_data.items() if 'stargate_contract' in src_data
+            for dst_network_name in Stargate.contract_data if dst_network_name != src_network_name
+        ]
+        clients = {
+            src_network_name: Client(network=Stargate.networks[src_network_name])
+            for src_network_name in {src_network_name for src_network_name, dst_network_name in routes}
+        }
+
+        async def quote(src_network_name: str, dst_network_name: str) -> Optional[TokenAmount]:
+            client = clients[src_network_name]
+            try:
+                router_contract = await client.contracts.get(
+                    contract_address=Stargate.contract_data[src_network_name]['stargate_contract']
+                )
+                return await Stargate(client=client).get_value(
+                    router_contract=router_contract,
+                    to_network_name=dst_network_name,
+                    lz_tx_params=lz_tx_params,
+                    function_type=function_type
+                )
+            except Exception as e:
+                logger.error(f'Stargate | quote {src_network_name} -> {dst_network_name}: {e}')
+                return None
+
+        fees = await asyncio.gather(*[quote(*route) for route in routes])
+        return dict(zip(routes, fees))
 
     async def send_usdc_from_avalanche_to_usdt_bsc(
             self,
@@ -189,7 +255,7 @@ class Stargate(Base):
                 _dstPoolId=Stargate.contract_data[to_network_name]['dst_pool_id'],
                 _refundAddress=self.client.account.address,
                 _amountLD=amount.Wei,
-                _minAmountLD=int(amount.Wei * (100 - slippage) / 100),
+                _minAmountLD=min_amount(amount=amount.Wei, slippage=slippage),
                 _lzTxParams=lz_tx_params.tuple(),
                 _to=self.client.account.address,
                 _payload='0x'
@@ -206,20 +272,19 @@ class Stargate(Base):
             if native_balance.Wei < value.Wei:
                 return f'{failed_text}: To low native balance: balance: {native_balance.Ether}; value: {value.Ether}'
 
-            token_price = await self.get_token_price(token=self.client.network.coin_symbol)
-            dest_native_token_price = await self.get_token_price(token='BNB') # костыль
+            prices = await price_service.prices([self.client.network.coin_symbol, 'BNB'])  # костыль
+            token_price = prices[self.client.network.coin_symbol.upper()]
+            dest_native_token_price = prices['BNB']
             dst_native_amount_dollar = float(dest_fee.Ether) * dest_native_token_price
             network_fee = float(value.Ether) * token_price
             if network_fee - dst_native_amount_dollar > max_fee:
                 return f'{failed_text} | too high fee: {network_fee - dst_native_amount_dollar} ({self.client.network.name})'
 
-            if await self.approve_interface(
+            if not await self.approve_interface(
                     token_address=usdc_contract.address,
                     spender=stargate_contract.address,
                     amount=amount
             ):
-                await asyncio.sleep(random.randint(5, 10))
-            else:
                 return f'{failed_text} | can not approve'
 
             tx_params = TxParams(
@@ -228,8 +293,11 @@ class Stargate(Base):
                 value=value.Wei
             )
 
-            tx = await self.client.transactions.sign_and_send(tx_params=tx_params)
-            receipt = await tx.wait_for_receipt(client=self.client, timeout=300)
+            tx = await self.send(tx_params=tx_params)
+            receipt = await self.confirmed(tx, timeout=300)
+            self.spent(
+                token_address=usdc_contract.address, spender=stargate_contract.address, amount=amount, success=receipt
+            )
             if receipt:
                 return f'{amount.Ether} USDC was send from {self.client.network.name} to {to_network_name} via Stargate: {tx.hash.hex()}'
             return f'{failed_text}!'
@@ -237,5 +305,104 @@ class Stargate(Base):
         except Exception as e:
             return f'{failed_text}: {e}'
 
+    @staticmethod
+    async def find_usdc(addresses: List[str]) -> Dict[str, Dict[str, Dict[str, TokenAmount]]]:
+        network_names = [
+            network_name for network_name, data in Stargate.contract_data.items() if 'usdc_contract' in data
+        ]
+
+        async def scan(network_name: str) -> Dict[str, Dict[str, TokenAmount]]:
+            multicall = Multicall(client=Client(network=Stargate.networks[network_name]))
+            usdc_address = Stargate.contract_data[network_name]['usdc_contract'].address
+            try:
+                block = await multicall.client.w3.eth.block_number
+                usdc_balances, native_balances = await asyncio.gather(
+                    multicall.balances([(address, usdc_address) for address in addresses], block=block),
+                    multicall.native_balances(addresses, block=block)
+                )
+            except Exception as e:
+                logger.error(f'Stargate | scan USDC on {network_name}: {e}')
+                return {}
+
+            return {
+                address: {'usdc': usdc_balances[(address, token)], 'native': native_balances[address]}
+                for address, token in usdc_balances if address in native_balances
+            }
+
+        balances = await asyncio.gather(*[scan(network_name) for network_name in network_names])
+        return dict(zip(network_names, balances))
+
+    @staticmethod
+    async def gas_prices(network_names: List[str]) -> Dict[str, Optional[int]]:
+        async def gas_price(network_name: str) -> Optional[int]:
+            try:
+                fee = await gas_oracle.suggest(client=Client(network=Stargate.networks[network_name]))
+            except Exception as e:
+                logger.error(f'Stargate | gas price on {network_name}: {e}')
+                return None
+            return fee.get('maxFeePerGas', fee.get('gasPrice'))
+
+        prices = await asyncio.gather(*[gas_price(network_name) for network_name in network_names])
+        return dict(zip(network_names, prices))
+
+    @staticmethod
+    async def coin_prices(network_names: List[str]) -> Dict[str, Optional[float]]:
+        symbols = {network_name: Stargate.networks[network_name].coin_symbol.upper() for network_name in network_names}
+        try:
+            await price_service.prices(list(symbols.values()))
+        except PriceError as e:
+            logger.error(f'Stargate | coin prices: {e}')
+        return {network_name: price_service.cached(symbol) for network_name, symbol in symbols.items()}
+
+    @staticmethod
+    async def plan_usdc(addresses: List[str], to_network_name: Optional[str] = None) -> List[Bridge]:
+        balances, fees = await asyncio.gather(Stargate.find_usdc(addresses), Stargate.quote_matrix())
+        coin_prices, gas_prices = await asyncio.gather(
+            Stargate.coin_prices(list(balances)), Stargate.gas_prices(list(balances))
+        )
 
-    # todo: написать функцию поиска usdc по доступным сетям
+        plans = []
+        destinations = [to_network_name] if to_network_name else list(Stargate.contract_data)
+        for dst_network_name in destinations:
+            bridges = []
+            stranded = sum(
+                float(wallet['usdc'].Ether)
+                for src_network_name, wallets in balances.items() if src_network_name != dst_network_name
+                for wallet in wallets.values()
+            )
+            for src_network_name, wallets in balances.items():
+                fee = fees.get((src_network_name, dst_network_name))
+                coin_price, gas_price = coin_prices[src_network_name], gas_prices[src_network_name]
+                if src_network_name == dst_network_name or not fee or coin_price is None or gas_price is None:
+                    continue
+
+                chain_id = Stargate.networks[src_network_name].chain_id
+                usdc_address = Stargate.contract_data[src_network_name]['usdc_contract'].address
+                spender = Stargate.contract_data[src_network_name]['stargate_contract'].address
+                for address, wallet in wallets.items():
+                    approved = allowance_cache.get(chain_id, address, usdc_address, spender)
+                    gas_limit = Stargate.swap_gas_limit
+                    if approved is None or approved < wallet['usdc'].Wei:
+                        gas_limit += Stargate.approve_gas_limit
+                    gas = gas_price * gas_limit
+                    if wallet['usdc'].Wei <= 0 or wallet['native'].Wei < fee.Wei + gas:
+                        continue
+
+                    fee_usd = float(TokenAmount(fee.Wei + gas, wei=True).Ether) * coin_price
+                    if fee_usd >= float(wallet['usdc'].Ether):
+                        continue
+                    bridges.append(Bridge(
+                        address=address,
+                        from_network_name=src_network_name,
+                        to_network_name=dst_network_name,
+                        amount=wallet['usdc'],
+                        fee=fee,
+                        fee_usd=fee_usd
+                    ))
+            stranded -= sum(float(bridge.amount.Ether) for bridge in bridges)
+            bridges.sort(key=lambda bridge: bridge.fee_usd)
+            plans.append((round(stranded, 6), sum(bridge.fee_usd for bridge in bridges), bridges))
+
+        if not plans:
+            return []
+        return min(plans, key=lambda plan: plan[:2])[2]
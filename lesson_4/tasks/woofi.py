@@ -1,14 +1,20 @@
-import asyncio
 from typing import Optional
 from web3.types import TxParams
 from py_eth_async.data.models import TxArgs, TokenAmount
 from py_eth_async.data.models import RawContract
+from py_eth_async.client import Client
 
+from data.config import logger
 from data.models import Contracts
 from tasks.base import Base
+from utils.quoter import WooFiQuoter
 
 
 class WooFi(Base):
+    def __init__(self, client: Client):
+        super().__init__(client=client)
+        self.quoter = WooFiQuoter(client=client)
+
     async def swap(
             self,
             to_token: RawContract,
@@ -17,24 +23,29 @@ class WooFi(Base):
             slippage: float = 1
     ):
         contract = await self.client.contracts.get(contract_address=Contracts.ARBITRUM_WOOFI)
+        is_native = from_token.address == Contracts.ARBITRUM_ETH.address
 
-        from_token_name = 'ETH'
-        to_token_name = 'ETH'
-        if from_token.address != Contracts.ARBITRUM_ETH.address:
-            from_token_contract = await self.client.contracts.default_token(contract_address=from_token)
-            from_token_name = await from_token_contract.functions.symbol().call()
-        if to_token != Contracts.ARBITRUM_ETH.address:
-            to_token_contract = await self.client.contracts.default_token(contract_address=to_token)
-            to_token_name = await to_token_contract.functions.symbol().call()
+        reads = {
+            'from_token_name': self.get_symbol(contract_address=from_token.address),
+            'to_token_name': self.get_symbol(contract_address=to_token.address),
+            'from_token_balance': self.get_balance(contract_address=from_token.address),
+            'to_token_decimals': self.get_decimals(contract_address=to_token.address),
+        }
+        if amount:
+            reads['to_amount'] = self.quoter.quote(
+                from_token=from_token.address, to_token=to_token.address, amount=amount.Wei
+            )
+        if not is_native:
+            reads['approved_amounts'] = self.approved_amounts([(from_token.address, contract.address)])
+        prefetched, timings = await self.prefetch(**reads)
 
-        if from_token.address == Contracts.ARBITRUM_ETH.address:
-            from_token_balance = await self.client.wallet.balance()
-        else:
-            from_token_balance = await self.client.wallet.balance(token=from_token.address)
+        from_token_name = prefetched['from_token_name']
+        to_token_name = prefetched['to_token_name']
+        from_token_balance = prefetched['from_token_balance']
 
         if not amount:
-            if from_token.address == Contracts.ARBITRUM_ETH.address:
-                amount = TokenAmount(amount=float(from_token_balance.Ether) * 0.5)
+            if is_native:
+                amount = TokenAmount(amount=from_token_balance.Wei // 2, wei=True)
             else:
                 amount = from_token_balance
 
@@ -43,12 +54,25 @@ class WooFi(Base):
         if amount.Wei > from_token_balance.Wei:
             return f'{failed_text}: To low balance: {from_token_balance.Ether}'
 
-        from_token_price = await self.get_token_price(token=from_token_name)
-        to_token_price = await self.get_token_price(token=to_token_name)
+        to_amount = prefetched.get('to_amount')
+        if 'to_amount' not in prefetched:
+            quoted, quote_timings = await self.prefetch(to_amount=self.quoter.quote(
+                from_token=from_token.address, to_token=to_token.address, amount=amount.Wei
+            ))
+            to_amount = quoted['to_amount']
+            timings.update(quote_timings)
+
+        logger.info(
+            f'{self.client.account.address} | WooFi | pre-trade reads: '
+            + ' | '.join(f'{name}: {timing * 1000:.0f} ms' for name, timing in timings.items())
+        )
+        if not to_amount:
+            return f'{failed_text}: can not get quote'
 
         min_to_amount = TokenAmount(
-            amount=from_token_price / to_token_price * float(amount.Ether) * (1 - slippage / 100),
-            decimals=await self.get_decimals(contract_address=to_token.address)
+            amount=self.quoter.min_amount(to_amount=to_amount, slippage=slippage),
+            decimals=prefetched['to_token_decimals'],
+            wei=True
         )
 
         args = TxArgs(
@@ -63,15 +87,27 @@ class WooFi(Base):
         tx_params = TxParams(
             to=contract.address,
             data=contract.encodeABI('swap', args=args.tuple()),
-            value=amount.Wei if from_token.address == Contracts.ARBITRUM_ETH.address else 0
+            value=amount.Wei if is_native else 0
         )
 
-        if from_token.address != Contracts.ARBITRUM_ETH.address:
-            await self.approve_interface(token_address=from_token.address, spender=contract.address, amount=amount)
-            await asyncio.sleep(5)
+        if not is_native:
+            approval = await self.approve_interface(
+                token_address=from_token.address,
+                spender=contract.address,
+                amount=amount,
+                balance=from_token_balance,
+                approved_amount=prefetched['approved_amounts'].get((from_token.address, contract.address)),
+                wait=False
+            )
+            if not approval:
+                return f'{failed_text}: can not approve'
+            if approval is not True:
+                tx_params['gas'] = self.pipelined_gas_limit
 
-        tx = await self.client.transactions.sign_and_send(tx_params=tx_params)
-        receipt = await tx.wait_for_receipt(client=self.client, timeout=200)
+        tx = await self.send(tx_params=tx_params)
+        receipt = await self.confirmed(tx, timeout=200)
+        if not is_native:
+            self.spent(token_address=from_token.address, spender=contract.address, amount=amount, success=receipt)
         if receipt:
             return f'{amount.Ether} {from_token_name} was swaped to {min_to_amount.Ether} {to_token_name} via WooFi: {tx.hash.hex()}'
 
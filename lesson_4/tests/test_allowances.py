@@ -0,0 +1,94 @@
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip('py_eth_async')
+
+from utils.allowances import AllowanceCache
+
+OWNER = '0x' + '11' * 20
+TOKEN = '0x' + '22' * 20
+SPENDER = '0x' + '33' * 20
+KEY = (1, OWNER, TOKEN, SPENDER)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return AllowanceCache(path=str(tmp_path / 'allowances.json'), flush_interval=0.01)
+
+
+async def result(value):
+    await asyncio.sleep(0)
+    if isinstance(value, Exception):
+        raise value
+    return value
+
+
+def test_key_is_checksummed(cache):
+    cache.set(*KEY, amount=5)
+    assert cache.get(1, OWNER.upper().replace('0X', '0x'), TOKEN, SPENDER.lower()) == 5
+
+
+def test_spend_keeps_unlimited_and_floors_at_zero(cache):
+    cache.set(*KEY, amount=cache.unlimited)
+    cache.spend(*KEY, amount=10)
+    assert cache.get(*KEY) == cache.unlimited
+
+    cache.set(*KEY, amount=7)
+    cache.spend(*KEY, amount=10)
+    assert cache.get(*KEY) == 0
+
+
+def test_writes_are_debounced_and_flushed(cache):
+    async def main():
+        for amount in range(100):
+            cache.set(*KEY, amount=amount)
+        written_early = cache.dirty
+        await asyncio.sleep(0.05)
+        return written_early
+
+    assert asyncio.run(main()) is True
+    assert not cache.dirty
+    with open(cache.path) as file:
+        assert list(json.load(file)['allowances'].values()) == ['99']
+
+
+@pytest.mark.parametrize('confirmation, expected', [(True, 5), (False, None), (RuntimeError('timeout'), None)])
+def test_set_unconfirmed_forgets_failed_approvals(cache, confirmation, expected):
+    async def main():
+        task = cache.set_unconfirmed(*KEY, amount=5, confirmation=result(confirmation))
+        assert cache.get(*KEY) == 5
+        await task
+        return cache.unconfirmed
+
+    assert asyncio.run(main()) == {}
+    assert cache.get(*KEY) == expected
+
+
+def test_flush_is_rescheduled_on_a_new_loop(cache):
+    cache.flush_interval = 60
+
+    async def mark():
+        cache.set(*KEY, amount=1)
+
+    asyncio.run(mark())
+    cache.flush_interval = 0.01
+
+    async def mark_and_wait():
+        cache.set(*KEY, amount=2)
+        await asyncio.sleep(0.05)
+
+    asyncio.run(mark_and_wait())
+    assert not cache.dirty
+    with open(cache.path) as file:
+        assert json.load(file)['allowances'] == {cache.key(*KEY): '2'}
+
+
+def test_save_reads_existing_file_before_truncating(cache):
+    cache.set(*KEY, amount=3)
+    cache.save()
+    reloaded = AllowanceCache(path=cache.path)
+    reloaded.synced['1:' + OWNER] = 10
+    reloaded.save()
+    assert AllowanceCache(path=cache.path).get(*KEY) == 3
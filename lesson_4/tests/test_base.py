@@ -0,0 +1,149 @@
+import asyncio
+import socket
+import time
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip('py_eth_async')
+
+from eth_account import Account
+from py_eth_async.client import Client
+from py_eth_async.data.models import Network, TokenAmount
+from web3 import Web3
+
+from mocks.rpc_node import RPCNode
+from tasks.base import Base
+from utils.allowances import allowance_cache
+from utils.receipts import receipt_watcher
+
+OWNER = '0x' + '11' * 20
+TOKEN = '0x' + '22' * 20
+SPENDER = '0x' + '33' * 20
+
+
+@pytest.fixture
+def isolated_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(allowance_cache, 'path', str(tmp_path / 'allowances.json'))
+    monkeypatch.setattr(allowance_cache, 'allowances', {})
+    monkeypatch.setattr(allowance_cache, 'synced', {})
+    monkeypatch.setattr(allowance_cache, 'dirty', False)
+    monkeypatch.setattr(allowance_cache, 'flush_handle', None)
+
+
+@pytest.fixture
+def base(isolated_cache, monkeypatch):
+    client = SimpleNamespace(network=SimpleNamespace(chain_id=1, name='test'), account=SimpleNamespace(address=OWNER))
+    base = Base(client=client)
+    approvals = []
+
+    async def approve(token_address, spender, amount, wait=True):
+        approvals.append(amount)
+        return True
+
+    monkeypatch.setattr(base, 'approve', approve)
+    base.approvals = approvals
+    return base
+
+
+def balance_of(wei: int):
+    async def get_balance(contract_address=None):
+        return TokenAmount(wei, decimals=6, wei=True)
+
+    return get_balance
+
+
+def test_cached_allowance_still_checks_balance(base, monkeypatch):
+    allowance_cache.set(1, OWNER, TOKEN, SPENDER, amount=allowance_cache.unlimited)
+    monkeypatch.setattr(base, 'get_balance', balance_of(0))
+    result = asyncio.run(base.approve_interface(TOKEN, SPENDER, amount=TokenAmount(1, decimals=6)))
+    assert result is False
+    assert base.approvals == []
+
+
+def test_cached_allowance_skips_approve(base, monkeypatch):
+    allowance_cache.set(1, OWNER, TOKEN, SPENDER, amount=10 ** 6)
+    monkeypatch.setattr(base, 'get_balance', balance_of(5 * 10 ** 6))
+    result = asyncio.run(base.approve_interface(TOKEN, SPENDER, amount=TokenAmount(1, decimals=6)))
+    assert result is True
+    assert base.approvals == []
+
+
+def test_insufficient_allowance_approves_capped_to_balance(base, monkeypatch):
+    allowance_cache.set(1, OWNER, TOKEN, SPENDER, amount=10)
+    monkeypatch.setattr(base, 'get_balance', balance_of(2 * 10 ** 6))
+    result = asyncio.run(base.approve_interface(TOKEN, SPENDER, amount=TokenAmount(3, decimals=6)))
+    assert result is True
+    assert base.approvals == [2 * 10 ** 6]
+
+
+def test_prefetch_runs_reads_concurrently_and_times_each(base):
+    async def read(value, delay):
+        await asyncio.sleep(delay)
+        return value
+
+    async def run():
+        started_at = time.monotonic()
+        results, timings = await base.prefetch(slow=read('a', 0.1), fast=read('b', 0.01))
+        return results, timings, time.monotonic() - started_at
+
+    results, timings, elapsed = asyncio.run(run())
+    assert results == {'slow': 'a', 'fast': 'b'}
+    assert timings['fast'] < 0.05 <= timings['slow']
+    assert elapsed < 0.15
+
+
+def test_prefetch_propagates_read_errors(base):
+    async def broken():
+        raise ConnectionError('node is down')
+
+    async def ok():
+        return 1
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(base.prefetch(ok=ok(), broken=broken()))
+
+
+@pytest.mark.parametrize('receipt, expected', [
+    ({'status': 1}, True), ({'status': 0}, False), (None, False),
+])
+def test_confirmed_follows_the_receipt(base, monkeypatch, receipt, expected):
+    async def wait(client, tx_hash, timeout):
+        return receipt
+
+    monkeypatch.setattr(receipt_watcher, 'wait', wait)
+    assert asyncio.run(base.confirmed(SimpleNamespace(hash=b'\x01'))) is expected
+
+
+def test_confirmed_passes_through_approve_results(base):
+    assert asyncio.run(base.confirmed(True)) is True
+    assert asyncio.run(base.confirmed(False)) is False
+
+
+def test_pre_approve_sends_only_missing_approvals(isolated_cache, monkeypatch):
+    monkeypatch.setattr(receipt_watcher, 'poll_interval', 0.01)
+
+    async def run():
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            port = sock.getsockname()[1]
+        node = RPCNode(latency=0, jitter=0, block_time=0.02)
+        url = await node.start(port=port)
+        try:
+            network = Network(name='arbitrum', rpc=url, chain_id=node.chain_id, tx_type=2, coin_symbol='ETH')
+            clients = [Client(private_key=Account.create().key.hex(), network=network) for _ in range(3)]
+            allowance_cache.set(
+                node.chain_id, clients[0].account.address, TOKEN, SPENDER, amount=allowance_cache.unlimited, save=False
+            )
+            results = await asyncio.wait_for(Base.pre_approve(clients, [(TOKEN, SPENDER)]), 10)
+            return clients, results, node.stats
+        finally:
+            await node.stop()
+
+    clients, results, stats = asyncio.run(run())
+    assert results == {
+        (client.account.address, Web3.to_checksum_address(TOKEN), Web3.to_checksum_address(SPENDER)): True
+        for client in clients
+    }
+    assert stats['eth_sendRawTransaction'] == 2
+    assert allowance_cache.get(clients[1].network.chain_id, clients[1].account.address, TOKEN, SPENDER) == allowance_cache.unlimited
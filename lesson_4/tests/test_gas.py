@@ -0,0 +1,65 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip('py_eth_async')
+
+from utils.gas import GasOracle
+from utils.quoter import quote_cache
+
+
+class Eth:
+    def __init__(self) -> None:
+        self.block = 100
+        self.fee_histories = 0
+
+    @property
+    async def block_number(self) -> int:
+        return self.block
+
+    @property
+    async def gas_price(self) -> int:
+        return 30
+
+    async def fee_history(self, block_count, newest_block, percentiles):
+        self.fee_histories += 1
+        return {
+            'oldestBlock': self.block - block_count + 1,
+            'baseFeePerGas': [10] * (block_count + 1),
+            'reward': [[1, 2, 3]] * block_count,
+        }
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(quote_cache, 'blocks', {})
+    monkeypatch.setattr(quote_cache, 'block_ttl', 0)
+    return SimpleNamespace(network=SimpleNamespace(chain_id=1, name='test', tx_type=2), w3=SimpleNamespace(eth=Eth()))
+
+
+def test_fees_are_reused_until_a_new_block(client):
+    oracle = GasOracle()
+
+    async def run():
+        first = await oracle.suggest(client)
+        assert await oracle.suggest(client) == first
+        assert client.w3.eth.fee_histories == 1
+
+        client.w3.eth.block += 1
+        await oracle.suggest(client)
+        assert client.w3.eth.fee_histories == 2
+
+    asyncio.run(run())
+    assert oracle.fees[1][0] == 101
+
+
+def test_concurrent_suggestions_share_one_fetch(client):
+    oracle = GasOracle()
+
+    async def run():
+        return await asyncio.gather(*[oracle.suggest(client, strategy='fast') for _ in range(10)])
+
+    fees = asyncio.run(run())
+    assert client.w3.eth.fee_histories == 1
+    assert fees[0] == {'maxPriorityFeePerGas': 3, 'maxFeePerGas': 23}
@@ -0,0 +1,56 @@
+import asyncio
+import socket
+
+import pytest
+
+pytest.importorskip('py_eth_async')
+
+from eth_account import Account
+from py_eth_async.client import Client
+from py_eth_async.data.models import Network
+
+from benchmarks.load import run_scenario
+from mocks.rpc_node import RPCNode
+from utils.allowances import allowance_cache
+from utils.receipts import receipt_watcher
+from utils.tokens import token_registry
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def isolated(tmp_path, monkeypatch):
+    monkeypatch.setattr(allowance_cache, 'path', str(tmp_path / 'allowances.json'))
+    monkeypatch.setattr(allowance_cache, 'allowances', {})
+    monkeypatch.setattr(allowance_cache, 'dirty', False)
+    monkeypatch.setattr(allowance_cache, 'flush_handle', None)
+    monkeypatch.setattr(token_registry, 'path', str(tmp_path / 'tokens.json'))
+    monkeypatch.setattr(token_registry, 'memory', type(token_registry.memory)())
+    monkeypatch.setattr(token_registry, 'disk', None)
+    monkeypatch.setattr(token_registry, 'dirty', False)
+    monkeypatch.setattr(token_registry, 'flush_handle', None)
+    monkeypatch.setattr(receipt_watcher, 'poll_interval', 0.02)
+
+
+@pytest.mark.parametrize('scenario', ['balance', 'approve'])
+def test_scenarios_run_clean_against_the_mock_node(isolated, scenario):
+    async def run():
+        node = RPCNode(latency=0.001, jitter=0, block_time=0.05)
+        url = await node.start(port=free_port())
+        try:
+            network = Network(name='arbitrum', rpc=url, chain_id=node.chain_id, tx_type=2, coin_symbol='ETH')
+            clients = [Client(private_key=Account.create().key.hex(), network=network) for _ in range(4)]
+            return await asyncio.wait_for(run_scenario(name=scenario, clients=clients, concurrency=2), 10)
+        finally:
+            await node.stop()
+
+    report = asyncio.run(run())
+    allowance_cache.flush()
+    token_registry.flush()
+    assert report['ops'] == 4
+    assert not report['errors']
+    assert report['p50'] <= report['p95'] <= report['max']
@@ -0,0 +1,58 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip('py_eth_async')
+
+from py_eth_async.data.models import TxArgs
+
+from utils.lz_fees import LayerZeroFees
+
+WALLET = '0x' + '11' * 20
+
+
+def make_router(calls: list):
+    def quote_layer_zero_fee(dst_chain_id, function_type, to_address, payload, lz_tx_params):
+        async def call():
+            calls.append(dst_chain_id)
+            await asyncio.sleep(0.01)
+            return [dst_chain_id * 10 ** 12, 0]
+
+        return SimpleNamespace(call=call)
+
+    return SimpleNamespace(functions=SimpleNamespace(quoteLayerZeroFee=quote_layer_zero_fee))
+
+
+def lz_tx_params(dst_native_amount: int = 0) -> TxArgs:
+    return TxArgs(dstGasForCall=0, dstNativeAmount=dst_native_amount, dstNativeAddr=WALLET)
+
+
+def test_concurrent_quotes_for_a_route_share_one_call():
+    calls = []
+    fees = LayerZeroFees()
+    router = make_router(calls)
+
+    async def run():
+        return await asyncio.gather(
+            *[fees.quote(router, 'arbitrum', 109, WALLET, lz_tx_params()) for _ in range(5)],
+            fees.quote(router, 'arbitrum', 106, WALLET, lz_tx_params()),
+            fees.quote(router, 'arbitrum', 109, WALLET, lz_tx_params(dst_native_amount=1)),
+        )
+
+    quotes = asyncio.run(run())
+    assert sorted(calls) == [106, 109, 109]
+    assert {quote.Wei for quote in quotes[:5]} == {109 * 10 ** 12}
+    assert quotes[5].Wei == 106 * 10 ** 12
+    assert not fees.in_flight
+
+
+def test_quotes_expire_after_ttl():
+    calls = []
+    fees = LayerZeroFees(ttl=60)
+    router = make_router(calls)
+    asyncio.run(fees.quote(router, 'polygon', 110, WALLET, lz_tx_params()))
+    asyncio.run(fees.quote(router, 'polygon', 110, WALLET, lz_tx_params()))
+    fees.ttl = -1
+    asyncio.run(fees.quote(router, 'polygon', 110, WALLET, lz_tx_params()))
+    assert calls == [110, 110]
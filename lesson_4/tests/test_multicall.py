@@ -0,0 +1,65 @@
+import asyncio
+import os
+import socket
+
+import pytest
+
+pytest.importorskip('py_eth_async')
+
+from eth_account import Account
+from py_eth_async.client import Client
+from py_eth_async.data.models import Network
+
+from mocks.rpc_node import RPCNode
+from utils.multicall import Multicall
+
+LESSONS_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+TOKEN = '0xaf88d065e77c8cC2239327C5EDb3A432268e5831'
+SPENDER = '0x9aEd3A8896A85FE9a8CAc52C9B402D092B629a30'
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+async def with_multicall(read):
+    node = RPCNode(latency=0, jitter=0)
+    url = await node.start(port=free_port())
+    try:
+        network = Network(name='arbitrum', rpc=url, chain_id=node.chain_id, tx_type=2, coin_symbol='ETH')
+        client = Client(private_key=Account.create().key.hex(), network=network)
+        return await read(Multicall(client=client, chunk_size=3), client.account.address), node.stats
+    finally:
+        await node.stop()
+
+
+def test_reads_are_chunked_into_aggregate_calls():
+    async def read(multicall, owner):
+        return await multicall.balances([(owner, TOKEN)] * 5 + [(SPENDER, TOKEN)] * 2)
+
+    balances, stats = asyncio.run(with_multicall(read))
+    assert {amount.Wei for amount in balances.values()} == {1_000 * 10 ** 6}
+    assert {amount.decimals for amount in balances.values()} == {6}
+    assert stats['eth_call'] == 3
+
+
+def test_allowances_and_native_balances_are_keyed_by_checksum_address():
+    async def read(multicall, owner):
+        return await asyncio.gather(
+            multicall.allowances([(owner.lower(), TOKEN.lower(), SPENDER.lower())]),
+            multicall.native_balances([owner.lower()])
+        ), owner
+
+    ((allowances, native), owner), stats = asyncio.run(with_multicall(read))
+    assert allowances[(owner, TOKEN, SPENDER)].Wei == 0
+    assert native[owner].Wei == 10 * 10 ** 18
+
+
+def test_lesson_3_copy_matches():
+    copies = []
+    for lesson in ('lesson_3', 'lesson_4'):
+        with open(os.path.join(LESSONS_DIR, lesson, 'utils', 'multicall.py')) as file:
+            copies.append(file.read().split('"""', 2)[2])
+    assert copies[0] == copies[1]
@@ -0,0 +1,123 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip('py_eth_async')
+
+from utils.nonce import NonceManager
+
+CLIENT = SimpleNamespace(network=SimpleNamespace(chain_id=1), account=SimpleNamespace(address='0xowner'))
+
+
+class Node:
+    def __init__(self, pending: int = 0) -> None:
+        self.pending = pending
+        self.calls = 0
+
+    async def __call__(self, client) -> int:
+        self.calls += 1
+        return self.pending
+
+
+def manager(node: Node) -> NonceManager:
+    nonce_manager = NonceManager()
+    nonce_manager.pending_nonce = node
+    return nonce_manager
+
+
+def test_reserve_is_sequential_and_queries_node_once():
+    async def main():
+        node = Node(pending=5)
+        nonce_manager = manager(node)
+        nonces = await asyncio.gather(*[nonce_manager.reserve(CLIENT) for _ in range(4)])
+        return sorted(nonces), node.calls
+
+    assert asyncio.run(main()) == ([5, 6, 7, 8], 1)
+
+
+def test_release_of_latest_nonce_gives_it_back_without_rpc():
+    async def main():
+        node = Node()
+        nonce_manager = manager(node)
+        first = await nonce_manager.reserve(CLIENT)
+        await nonce_manager.sent(CLIENT, first)
+        second = await nonce_manager.reserve(CLIENT)
+        await nonce_manager.release(CLIENT, second)
+        return await nonce_manager.reserve(CLIENT), node.calls
+
+    assert asyncio.run(main()) == (1, 1)
+
+
+def test_out_of_order_release_is_refilled_before_new_nonces():
+    async def main():
+        nonce_manager = manager(Node())
+        a, b = await nonce_manager.reserve(CLIENT), await nonce_manager.reserve(CLIENT)
+        await nonce_manager.sent(CLIENT, b)
+        await nonce_manager.release(CLIENT, a)
+        return a, b, await nonce_manager.reserve(CLIENT), await nonce_manager.reserve(CLIENT)
+
+    assert asyncio.run(main()) == (0, 1, 0, 2)
+
+
+def test_release_collapses_trailing_gaps():
+    async def main():
+        nonce_manager = manager(Node())
+        nonces = [await nonce_manager.reserve(CLIENT) for _ in range(3)]
+        await nonce_manager.release(CLIENT, nonces[1])
+        await nonce_manager.release(CLIENT, nonces[2])
+        return await nonce_manager.reserve(CLIENT), await nonce_manager.reserve(CLIENT)
+
+    assert asyncio.run(main()) == (1, 2)
+
+
+def test_lagging_node_does_not_hand_out_in_flight_nonce():
+    async def main():
+        node = Node()
+        nonce_manager = manager(node)
+        for _ in range(3):
+            await nonce_manager.sent(CLIENT, await nonce_manager.reserve(CLIENT))
+        node.pending = 1
+        await nonce_manager.resync(CLIENT)
+        return await nonce_manager.reserve(CLIENT)
+
+    assert asyncio.run(main()) == 3
+
+
+def test_resync_jumps_ahead_when_node_is_ahead():
+    async def main():
+        node = Node()
+        nonce_manager = manager(node)
+        a, b = await nonce_manager.reserve(CLIENT), await nonce_manager.reserve(CLIENT)
+        await nonce_manager.sent(CLIENT, b)
+        await nonce_manager.release(CLIENT, a)
+        node.pending = 10
+        await nonce_manager.resync(CLIENT)
+        return await nonce_manager.reserve(CLIENT)
+
+    assert asyncio.run(main()) == 10
+
+
+def test_resync_is_deferred_while_nonces_are_outstanding():
+    async def main():
+        node = Node()
+        nonce_manager = manager(node)
+        a, b = await nonce_manager.reserve(CLIENT), await nonce_manager.reserve(CLIENT)
+        node.pending = 7
+        await nonce_manager.resync(CLIENT)
+        deferred = node.calls, nonce_manager.nonces[nonce_manager.key(CLIENT)]
+        await nonce_manager.sent(CLIENT, a)
+        still_deferred = node.calls
+        await nonce_manager.release(CLIENT, b)
+        return deferred, still_deferred, node.calls, await nonce_manager.reserve(CLIENT)
+
+    assert asyncio.run(main()) == ((1, 2), 1, 2, 7)
+
+
+@pytest.mark.parametrize('message, expected', [
+    ('nonce too low', True),
+    ('replacement transaction underpriced', True),
+    ('execution reverted', False),
+])
+def test_nonce_error(message, expected):
+    assert NonceManager.nonce_error(Exception(message)) is expected
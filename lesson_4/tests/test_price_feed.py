@@ -0,0 +1,71 @@
+import asyncio
+
+from aiohttp import web
+
+from utils.price_feed import PriceFeed
+from utils.prices import price_service
+
+
+def ticker(token: str, bid: float, ask: float) -> dict:
+    return {'stream': f'{token.lower()}usdt@bookTicker', 'data': {'s': f'{token}USDT', 'b': str(bid), 'a': str(ask)}}
+
+
+async def serve(connections: list, release: asyncio.Event):
+    async def stream(request):
+        connections.append(request.query['streams'])
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        await release.wait()
+        for ask in (1990., 2005., 2010.):
+            await ws.send_json(ticker('ETH', ask - 1, ask))
+        await ws.close()
+        return ws
+
+    app = web.Application()
+    app.router.add_get('/stream', stream)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    return runner, f'http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/stream'
+
+
+def test_waiters_subscribers_and_reconnect(monkeypatch):
+    monkeypatch.setattr(price_service, 'quotes', {})
+
+    async def run():
+        connections = []
+        release = asyncio.Event()
+        runner, url = await serve(connections, release)
+        feed = PriceFeed(['eth', 'bnb'], url=url, reconnect_delay=0.01).start()
+        try:
+            await asyncio.wait_for(feed.connected.wait(), 1)
+            updates = feed.subscribe('eth')
+            first = asyncio.ensure_future(updates.__anext__())
+            crossed = asyncio.ensure_future(feed.wait_for('ETH', lambda ask: ask > 2000))
+            ran = []
+
+            async def task():
+                ran.append(feed.price('ETH'))
+                return 'done'
+
+            when = asyncio.ensure_future(feed.when('eth', lambda ask: ask >= 2000, task, timeout=1))
+            await asyncio.sleep(0.01)
+            release.set()
+            assert await when == 'done'
+            assert ran[0] >= 2000
+            assert await first == (1989., 1990.)
+            assert await crossed == 2005.
+            assert price_service.cached('ETH') is not None
+
+            while len(connections) < 2:
+                await asyncio.sleep(0.01)
+            await updates.aclose()
+            return connections, feed.waiters
+        finally:
+            await feed.stop()
+            await runner.cleanup()
+
+    connections, waiters = asyncio.run(run())
+    assert connections[0] == 'ethusdt@bookTicker/bnbusdt@bookTicker'
+    assert waiters == []
@@ -0,0 +1,64 @@
+import asyncio
+import json
+
+import pytest
+from aiohttp import web
+
+from utils.prices import PriceError, PriceService
+
+LISTED = {'ETH': 2000., 'BNB': 300.}
+
+
+async def serve(requests: list):
+    async def book_ticker(request):
+        symbols = json.loads(request.query['symbols'])
+        requests.append(symbols)
+        if any(symbol[:-len('USDT')] not in LISTED for symbol in symbols):
+            return web.json_response({'code': -1121, 'msg': 'Invalid symbol.'}, status=400)
+        return web.json_response([
+            {'symbol': symbol, 'askPrice': str(LISTED[symbol[:-len('USDT')]])} for symbol in symbols
+        ])
+
+    app = web.Application()
+    app.router.add_get('/ticker/bookTicker', book_ticker)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f'http://127.0.0.1:{port}/ticker/bookTicker'
+
+
+def test_invalid_symbol_falls_back_to_single_requests():
+    async def run():
+        requests = []
+        runner, url = await serve(requests)
+        service = PriceService(backoff=0)
+        service.url = url
+        try:
+            with pytest.raises(PriceError, match='MATIC'):
+                await service.prices(['ETH', 'MATIC', 'BNB'])
+            assert await service.prices(['ETH', 'BNB']) == LISTED
+            assert len(requests) == 4
+            assert sorted(requests[1:]) == [['BNBUSDT'], ['ETHUSDT'], ['MATICUSDT']]
+        finally:
+            await service.close()
+            await runner.cleanup()
+
+    asyncio.run(run())
+
+
+def test_bulk_request_when_all_symbols_are_listed():
+    async def run():
+        requests = []
+        runner, url = await serve(requests)
+        service = PriceService(backoff=0)
+        service.url = url
+        try:
+            assert await service.prices(['eth', 'BNB', 'USDT']) == {**LISTED, 'USDT': 1.}
+            assert requests == [['ETHUSDT', 'BNBUSDT']]
+        finally:
+            await service.close()
+            await runner.cleanup()
+
+    asyncio.run(run())
@@ -0,0 +1,60 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip('py_eth_async')
+
+from utils.amounts import min_amount
+from utils.quoter import WooFiQuoter, quote_cache
+
+USDC = '0x' + 'aa' * 20
+WETH = '0x' + 'bb' * 20
+
+
+class Eth:
+    def __init__(self) -> None:
+        self.block = 10
+
+    @property
+    async def block_number(self) -> int:
+        return self.block
+
+
+@pytest.fixture
+def quoter(monkeypatch):
+    monkeypatch.setattr(quote_cache, 'blocks', {})
+    monkeypatch.setattr(quote_cache, 'quotes', {})
+    monkeypatch.setattr(quote_cache, 'block_ttl', 0)
+    client = SimpleNamespace(network=SimpleNamespace(chain_id=42161), w3=SimpleNamespace(eth=Eth()))
+    quoter = WooFiQuoter(client=client)
+    quoter.calls = []
+
+    async def aggregate(calls, block=None):
+        quoter.calls.append((len(calls), block))
+        return [(index + 1).to_bytes(32, 'big') if index % 2 == 0 else None for index in range(len(calls))]
+
+    monkeypatch.setattr(quoter.multicall, 'aggregate', aggregate)
+    monkeypatch.setattr(quoter.multicall, 'decode_uint', lambda data: int.from_bytes(data, 'big') if data else None)
+    return quoter
+
+
+def test_quotes_are_batched_and_cached_per_block(quoter):
+    swaps = [(USDC, WETH, 100), (USDC, WETH, 200), (USDC.upper().replace('0X', '0x'), WETH, 100)]
+
+    async def run():
+        first = await quoter.quotes_for(swaps)
+        again = await quoter.quotes_for(swaps[:2])
+        quoter.client.w3.eth.block += 1
+        await quoter.quotes_for(swaps[:1])
+        return first, again
+
+    first, again = asyncio.run(run())
+    assert list(first.values()) == [1, None]
+    assert again == first
+    assert quoter.calls == [(2, 10), (1, 11)]
+
+
+def test_min_amount_rounds_slippage_to_basis_points():
+    assert WooFiQuoter.min_amount(to_amount=1_000_000, slippage=0.29) == 997_100
+    assert min_amount(amount=10 ** 18, slippage=1) == 99 * 10 ** 16
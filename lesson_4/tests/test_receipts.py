@@ -0,0 +1,95 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip('py_eth_async')
+
+from utils import receipts
+from utils.receipts import ReceiptWatcher
+
+
+def make_client(endpoint_uri: str = 'http://node/', chain_id: int = 1):
+    provider = SimpleNamespace(endpoint_uri=endpoint_uri, get_request_kwargs=lambda: {})
+    return SimpleNamespace(network=SimpleNamespace(chain_id=chain_id, name='test'), w3=SimpleNamespace(provider=provider))
+
+
+def receipt(tx_hash: str) -> dict:
+    return {'transactionHash': tx_hash, 'blockNumber': '0x1', 'status': '0x1'}
+
+
+class SlowSession:
+    def __init__(self, closing: asyncio.Event, release: asyncio.Event) -> None:
+        self.closing = closing
+        self.release = release
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        self.closing.set()
+        await self.release.wait()
+
+
+def fake_rpc(mined: set, failing: set = frozenset()):
+    async def rpc(session, client, requests):
+        if client.w3.provider.endpoint_uri in failing:
+            raise ConnectionError('endpoint is down')
+        results = []
+        for method, params in requests:
+            if method == 'eth_blockNumber':
+                results.append('0x1')
+            else:
+                results.append(receipt(params[0]) if params[0] in mined else None)
+        return results
+
+    return rpc
+
+
+def test_wait_returns_parsed_receipt(monkeypatch):
+    async def main():
+        watcher = ReceiptWatcher(poll_interval=0.01)
+        monkeypatch.setattr(watcher, 'rpc', fake_rpc(mined={'0x01'}))
+        return await watcher.wait(client=make_client(), tx_hash='0x01', timeout=1)
+
+    assert asyncio.run(main())['status'] == 1
+
+
+def test_wait_times_out_and_forgets_hash(monkeypatch):
+    async def main():
+        watcher = ReceiptWatcher(poll_interval=0.01)
+        monkeypatch.setattr(watcher, 'rpc', fake_rpc(mined=set()))
+        result = await watcher.wait(client=make_client(), tx_hash='0x01', timeout=0.1)
+        return result, watcher.pending[1]
+
+    assert asyncio.run(main()) == (None, {})
+
+
+def test_wait_during_watcher_shutdown_starts_new_watcher(monkeypatch):
+    async def main():
+        closing, release = asyncio.Event(), asyncio.Event()
+        monkeypatch.setattr(receipts.aiohttp, 'ClientSession', lambda: SlowSession(closing, release))
+        watcher = ReceiptWatcher(poll_interval=0.01)
+        monkeypatch.setattr(watcher, 'rpc', fake_rpc(mined={'0x01', '0x02'}))
+
+        assert await watcher.wait(client=make_client(), tx_hash='0x01', timeout=1)
+        await closing.wait()
+        second = asyncio.ensure_future(watcher.wait(client=make_client(), tx_hash='0x02', timeout=1))
+        await asyncio.sleep(0.05)
+        result = await second
+        release.set()
+        return result
+
+    assert asyncio.run(main())['transactionHash'] == '0x02'
+
+
+def test_poll_failure_rotates_client(monkeypatch):
+    async def main():
+        watcher = ReceiptWatcher(poll_interval=0.01)
+        monkeypatch.setattr(watcher, 'rpc', fake_rpc(mined={'0x01', '0x02'}, failing={'http://down/'}))
+        return await asyncio.gather(
+            watcher.wait(client=make_client('http://down/'), tx_hash='0x01', timeout=1),
+            watcher.wait(client=make_client('http://up/'), tx_hash='0x02', timeout=1)
+        )
+
+    assert all(asyncio.run(main()))
@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip('py_eth_async')
+
+from py_eth_async.data.models import TokenAmount
+
+from tasks.stargate import Stargate
+from utils.allowances import allowance_cache
+from utils.gas import gas_oracle
+from utils.prices import price_service
+
+WALLET = '0x' + '11' * 20
+GWEI = 10 ** 9
+
+
+@pytest.fixture
+def plan(tmp_path, monkeypatch):
+    monkeypatch.setattr(allowance_cache, 'path', str(tmp_path / 'allowances.json'))
+    monkeypatch.setattr(allowance_cache, 'allowances', {})
+    monkeypatch.setattr(allowance_cache, 'dirty', False)
+    monkeypatch.setattr(allowance_cache, 'flush_handle', None)
+    monkeypatch.setattr(price_service, 'quotes', {})
+    state = {'native': {}, 'gas_price': {}, 'prices': {'ETH': 2000., 'AVAX': 20.}}
+
+    async def find_usdc(addresses):
+        return {
+            network_name: {WALLET: {'usdc': TokenAmount(100, decimals=6), 'native': TokenAmount(native, wei=True)}}
+            for network_name, native in state['native'].items()
+        }
+
+    async def quote_matrix():
+        return {
+            (src, dst): TokenAmount(10 ** 15, wei=True)
+            for src in state['native'] for dst in Stargate.contract_data if dst != src
+        }
+
+    async def suggest(client, strategy='standard'):
+        return {'gasPrice': state['gas_price'][client.network.name]}
+
+    async def fetch(tokens):
+        for token in tokens:
+            if token in state['prices']:
+                price_service.save(token, state['prices'][token])
+
+    monkeypatch.setattr(Stargate, 'find_usdc', staticmethod(find_usdc))
+    monkeypatch.setattr(Stargate, 'quote_matrix', staticmethod(quote_matrix))
+    monkeypatch.setattr(gas_oracle, 'suggest', suggest)
+    monkeypatch.setattr(price_service, 'fetch', fetch)
+    return state
+
+
+def test_native_check_includes_approve_and_bridge_gas(plan):
+    bridge_fee = 10 ** 15
+    gas = (Stargate.swap_gas_limit + Stargate.approve_gas_limit) * GWEI
+    plan['native'] = {'arbitrum': bridge_fee + gas - 1}
+    plan['gas_price'] = {'arbitrum': GWEI}
+    assert asyncio.run(Stargate.plan_usdc([WALLET], to_network_name='polygon')) == []
+
+    plan['native'] = {'arbitrum': bridge_fee + gas}
+    bridges = asyncio.run(Stargate.plan_usdc([WALLET], to_network_name='polygon'))
+    assert [bridge.from_network_name for bridge in bridges] == ['arbitrum']
+    assert bridges[0].fee_usd == pytest.approx((bridge_fee + gas) / 10 ** 18 * 2000)
+
+
+def test_approved_wallet_needs_only_bridge_gas(plan):
+    data = Stargate.contract_data['arbitrum']
+    allowance_cache.set(
+        Stargate.networks['arbitrum'].chain_id, WALLET, data['usdc_contract'].address,
+        data['stargate_contract'].address, amount=allowance_cache.unlimited, save=False
+    )
+    plan['native'] = {'arbitrum': 10 ** 15 + Stargate.swap_gas_limit * GWEI}
+    plan['gas_price'] = {'arbitrum': GWEI}
+    bridges = asyncio.run(Stargate.plan_usdc([WALLET], to_network_name='polygon'))
+    assert [bridge.from_network_name for bridge in bridges] == ['arbitrum']
+
+
+def test_chain_without_price_is_skipped(plan):
+    plan['native'] = {'arbitrum': 10 ** 18, 'polygon': 10 ** 18}
+    plan['gas_price'] = {'arbitrum': GWEI, 'polygon': GWEI}
+    bridges = asyncio.run(Stargate.plan_usdc([WALLET], to_network_name='avalanche'))
+    assert [bridge.from_network_name for bridge in bridges] == ['arbitrum']
@@ -0,0 +1,156 @@
+import asyncio
+import atexit
+import json
+import os
+from typing import Awaitable, Dict, List, Optional, Tuple
+
+from py_eth_async.client import Client
+from web3 import Web3
+
+from data import config
+from utils.multicall import Multicall
+
+
+class AllowanceCache:
+    unlimited = 2 ** 256 - 1
+    approval_topic = Web3.keccak(text='Approval(address,address,uint256)').hex()
+
+    def __init__(self, path: str = os.path.join(config.FILES_DIR, 'allowances.json'), lookback: int = 10_000,
+                 flush_interval: float = 5) -> None:
+        self.path = path
+        self.lookback = lookback
+        self.flush_interval = flush_interval
+        self.allowances: Optional[Dict[str, int]] = None
+        self.synced: Dict[str, int] = {}
+        self.unconfirmed: Dict[str, asyncio.Task] = {}
+        self.dirty = False
+        self.flush_handle: Optional[asyncio.TimerHandle] = None
+        self.flush_loop: Optional[asyncio.AbstractEventLoop] = None
+        atexit.register(self.flush)
+
+    @staticmethod
+    def key(chain_id: int, owner: str, token: str, spender: str) -> str:
+        return ':'.join([str(chain_id)] + [Web3.to_checksum_address(address) for address in (owner, token, spender)])
+
+    def load(self) -> Dict[str, int]:
+        if self.allowances is None:
+            self.allowances = {}
+            if os.path.exists(self.path):
+                with open(self.path) as file:
+                    data = json.load(file)
+                self.allowances = {key: int(amount) for key, amount in data.get('allowances', {}).items()}
+                self.synced = data.get('synced', {})
+        return self.allowances
+
+    def save(self) -> None:
+        data = {'allowances': {key: str(amount) for key, amount in self.load().items()}, 'synced': self.synced}
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, 'w') as file:
+            json.dump(data, file)
+
+    def mark_dirty(self) -> None:
+        self.dirty = True
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+
+        if self.flush_handle is None or self.flush_handle.cancelled() or self.flush_loop is not loop:
+            if self.flush_handle is not None and self.flush_loop is not None and not self.flush_loop.is_closed():
+                self.flush_handle.cancel()
+            self.flush_handle = loop.call_later(self.flush_interval, self.flush)
+            self.flush_loop = loop
+
+    def flush(self) -> None:
+        if self.flush_handle is not None:
+            self.flush_handle.cancel()
+            self.flush_handle = None
+            self.flush_loop = None
+        if self.dirty:
+            self.dirty = False
+            self.save()
+
+    def get(self, chain_id: int, owner: str, token: str, spender: str) -> Optional[int]:
+        return self.load().get(self.key(chain_id, owner, token, spender))
+
+    def set(self, chain_id: int, owner: str, token: str, spender: str, amount: int, save: bool = True) -> None:
+        self.load()[self.key(chain_id, owner, token, spender)] = amount
+        if save:
+            self.mark_dirty()
+
+    def set_unconfirmed(self, chain_id: int, owner: str, token: str, spender: str, amount: int,
+                        confirmation: Awaitable[bool]) -> asyncio.Task:
+        key = self.key(chain_id, owner, token, spender)
+        self.set(chain_id, owner, token, spender, amount=amount)
+        task = asyncio.ensure_future(self.confirm(chain_id, owner, token, spender, confirmation))
+        self.unconfirmed[key] = task
+        task.add_done_callback(lambda _: self.unconfirmed.pop(key) if self.unconfirmed.get(key) is task else None)
+        return task
+
+    async def confirm(self, chain_id: int, owner: str, token: str, spender: str,
+                      confirmation: Awaitable[bool]) -> bool:
+        try:
+            confirmed = await confirmation
+        except Exception:
+            confirmed = False
+        if not confirmed:
+            self.forget(chain_id, owner, token, spender)
+        return confirmed
+
+    def forget(self, chain_id: int, owner: str, token: str, spender: str) -> None:
+        if self.load().pop(self.key(chain_id, owner, token, spender), None) is not None:
+            self.mark_dirty()
+
+    def spend(self, chain_id: int, owner: str, token: str, spender: str, amount: int) -> None:
+        allowance = self.get(chain_id, owner, token, spender)
+        if allowance is not None and allowance != self.unlimited:
+            self.set(chain_id, owner, token, spender, max(allowance - amount, 0))
+
+    async def read(self, client: Client, keys: List[Tuple[str, str, str]],
+                   refresh: bool = False) -> Dict[Tuple[str, str, str], int]:
+        chain_id = client.network.chain_id
+        keys = [tuple(Web3.to_checksum_address(address) for address in key) for key in keys]
+        missing = [key for key in keys if refresh or self.get(chain_id, *key) is None]
+        if missing:
+            allowances = await Multicall(client=client).allowances(missing)
+            for key in missing:
+                if key in allowances:
+                    self.set(chain_id, *key, amount=allowances[key].Wei, save=False)
+            self.mark_dirty()
+        return {key: self.get(chain_id, *key) for key in keys}
+
+    async def sync(self, client: Client, owners: List[str], chunk_size: int = 100) -> int:
+        chain_id = client.network.chain_id
+        self.load()
+        latest = await client.w3.eth.block_number
+        owners = [Web3.to_checksum_address(owner) for owner in owners]
+        groups: Dict[int, List[str]] = {}
+        for owner in owners:
+            synced = self.synced.get(f'{chain_id}:{owner}', latest - self.lookback)
+            from_block = max(synced + 1, latest - self.lookback)
+            if from_block <= latest:
+                groups.setdefault(from_block, []).append('0x' + owner[2:].lower().rjust(64, '0'))
+        if not groups:
+            return 0
+
+        chunks = await asyncio.gather(*[
+            client.w3.eth.get_logs({
+                'fromBlock': from_block,
+                'toBlock': latest,
+                'topics': [self.approval_topic, topics[i:i + chunk_size]]
+            }) for from_block, topics in groups.items() for i in range(0, len(topics), chunk_size)
+        ])
+        logs = [log for chunk in chunks for log in chunk]
+        for log in sorted(logs, key=lambda log: (log['blockNumber'], log['logIndex'])):
+            if len(log['topics']) < 3:
+                continue
+            owner, spender = (Web3.to_checksum_address(topic[-20:]) for topic in log['topics'][1:3])
+            amount = int.from_bytes(bytes(log['data']), 'big')
+            self.set(chain_id, owner, log['address'], spender, amount=amount, save=False)
+        for owner in owners:
+            self.synced[f'{chain_id}:{owner}'] = latest
+        self.mark_dirty()
+        return len(logs)
+
+
+allowance_cache = AllowanceCache()
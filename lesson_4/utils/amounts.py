@@ -0,0 +1,9 @@
+BPS = 10_000
+
+
+def slippage_bps(slippage: float) -> int:
+    return round(slippage * 100)
+
+
+def min_amount(amount: int, slippage: float) -> int:
+    return amount * (BPS - slippage_bps(slippage)) // BPS
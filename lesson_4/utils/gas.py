@@ -0,0 +1,76 @@
+import asyncio
+import statistics
+from typing import Dict, Optional, Tuple
+
+from py_eth_async.client import Client
+
+from data.config import logger
+from utils.quoter import quote_cache
+
+
+class GasOracle:
+    strategies = {'cheap': 10, 'standard': 50, 'fast': 90}
+
+    def __init__(self, block_count: int = 20, base_fee_multiplier: float = 2) -> None:
+        self.block_count = block_count
+        self.base_fee_multiplier = base_fee_multiplier
+        self.fees: Dict[int, Tuple[int, Dict[str, Dict[str, int]]]] = {}
+        self.in_flight: Dict[int, asyncio.Future] = {}
+
+    def cached(self, chain_id: int, block: int) -> Optional[Dict[str, Dict[str, int]]]:
+        fees = self.fees.get(chain_id)
+        if fees and fees[0] >= block:
+            return fees[1]
+        return None
+
+    async def fetch(self, client: Client) -> Tuple[int, Dict[str, Dict[str, int]]]:
+        percentiles = list(self.strategies.values())
+        history, gas_price = await asyncio.gather(
+            client.w3.eth.fee_history(self.block_count, 'latest', percentiles),
+            client.w3.eth.gas_price
+        )
+        block = history['oldestBlock'] + len(history['baseFeePerGas']) - 2
+        base_fee = history['baseFeePerGas'][-1]
+        rewards = [reward for reward in history.get('reward') or [] if reward]
+
+        fees = {}
+        for index, strategy in enumerate(self.strategies):
+            priority_fee = int(statistics.median(reward[index] for reward in rewards)) if rewards else 0
+            if not base_fee:
+                fees[strategy] = {'gasPrice': max(gas_price, priority_fee)}
+                continue
+
+            fees[strategy] = {
+                'gasPrice': max(gas_price, base_fee + priority_fee),
+                'maxPriorityFeePerGas': priority_fee,
+                'maxFeePerGas': int(base_fee * self.base_fee_multiplier) + priority_fee,
+            }
+
+        return block, fees
+
+    async def refresh(self, client: Client) -> Dict[str, Dict[str, int]]:
+        chain_id = client.network.chain_id
+        if chain_id not in self.in_flight:
+            self.in_flight[chain_id] = asyncio.ensure_future(self.fetch(client))
+        try:
+            block, fees = await asyncio.shield(self.in_flight[chain_id])
+        finally:
+            if chain_id in self.in_flight and self.in_flight[chain_id].done():
+                del self.in_flight[chain_id]
+
+        previous = self.fees.get(chain_id)
+        if not previous or previous[0] != block:
+            logger.debug(f'{client.network.name} | gas oracle | block {block}: {fees["standard"]}')
+        self.fees[chain_id] = (block, fees)
+        return fees
+
+    async def suggest(self, client: Client, strategy: str = 'standard') -> Dict[str, int]:
+        block = await quote_cache.block_number(client=client)
+        fees = self.cached(client.network.chain_id, block=block) or await self.refresh(client)
+        fee = fees[strategy]
+        if client.network.tx_type == 2 and 'maxFeePerGas' in fee:
+            return {'maxPriorityFeePerGas': fee['maxPriorityFeePerGas'], 'maxFeePerGas': fee['maxFeePerGas']}
+        return {'gasPrice': fee['gasPrice']}
+
+
+gas_oracle = GasOracle()
@@ -0,0 +1,51 @@
+import asyncio
+import time
+from typing import Dict, Optional, Tuple
+
+from py_eth_async.data.models import TokenAmount, TxArgs
+from web3.contract import AsyncContract
+
+
+class LayerZeroFees:
+    def __init__(self, ttl: float = 30) -> None:
+        self.ttl = ttl
+        self.quotes: Dict[Tuple, Tuple[float, TokenAmount]] = {}
+        self.in_flight: Dict[Tuple, asyncio.Future] = {}
+
+    @staticmethod
+    def key(src_network_name: str, dst_chain_id: int, function_type: int, lz_tx_params: TxArgs) -> Tuple:
+        return src_network_name, dst_chain_id, function_type, tuple(lz_tx_params.list())
+
+    def cached(self, key: Tuple) -> Optional[TokenAmount]:
+        quote = self.quotes.get(key)
+        if quote and time.monotonic() - quote[0] <= self.ttl:
+            return quote[1]
+        return None
+
+    async def quote(self, router_contract: AsyncContract, src_network_name: str, dst_chain_id: int,
+                    to_address: str, lz_tx_params: TxArgs, function_type: int = 1) -> TokenAmount:
+        key = self.key(src_network_name, dst_chain_id, function_type, lz_tx_params)
+        fee = self.cached(key)
+        if fee:
+            return fee
+
+        if key not in self.in_flight:
+            self.in_flight[key] = asyncio.ensure_future(router_contract.functions.quoteLayerZeroFee(
+                dst_chain_id,
+                function_type,
+                to_address,
+                '0x',
+                lz_tx_params.list()
+            ).call())
+        try:
+            res = await asyncio.shield(self.in_flight[key])
+        finally:
+            if key in self.in_flight and self.in_flight[key].done():
+                del self.in_flight[key]
+
+        fee = TokenAmount(amount=res[0], wei=True)
+        self.quotes[key] = (time.monotonic(), fee)
+        return fee
+
+
+layer_zero_fees = LayerZeroFees()
@@ -0,0 +1,93 @@
+import asyncio
+from typing import Dict, Set, Tuple
+
+from py_eth_async.client import Client
+
+
+class NonceManager:
+    def __init__(self) -> None:
+        self.nonces: Dict[Tuple[int, str], int] = {}
+        self.locks: Dict[Tuple[int, str], asyncio.Lock] = {}
+        self.outstanding: Dict[Tuple[int, str], Set[int]] = {}
+        self.gaps: Dict[Tuple[int, str], Set[int]] = {}
+        self.stale: Set[Tuple[int, str]] = set()
+
+    @staticmethod
+    def key(client: Client) -> Tuple[int, str]:
+        return client.network.chain_id, client.account.address
+
+    def lock(self, client: Client) -> asyncio.Lock:
+        key = self.key(client)
+        if key not in self.locks:
+            self.locks[key] = asyncio.Lock()
+        return self.locks[key]
+
+    @staticmethod
+    def nonce_error(err: Exception) -> bool:
+        message = str(err).lower()
+        return 'nonce' in message or 'replacement transaction underpriced' in message
+
+    async def pending_nonce(self, client: Client) -> int:
+        return await client.w3.eth.get_transaction_count(client.account.address, 'pending')
+
+    async def reserve(self, client: Client) -> int:
+        key = self.key(client)
+        async with self.lock(client):
+            if key not in self.nonces:
+                self.nonces[key] = await self.pending_nonce(client)
+
+            gaps = self.gaps.setdefault(key, set())
+            if gaps:
+                nonce = min(gaps)
+                gaps.discard(nonce)
+            else:
+                nonce = self.nonces[key]
+                self.nonces[key] += 1
+            self.outstanding.setdefault(key, set()).add(nonce)
+            return nonce
+
+    async def sent(self, client: Client, nonce: int) -> None:
+        key = self.key(client)
+        async with self.lock(client):
+            self.outstanding.get(key, set()).discard(nonce)
+            if key in self.stale and not self.outstanding[key]:
+                await self._resync(client)
+
+    async def release(self, client: Client, nonce: int) -> None:
+        key = self.key(client)
+        async with self.lock(client):
+            self.outstanding.get(key, set()).discard(nonce)
+            gaps = self.gaps.setdefault(key, set())
+            if nonce == self.nonces.get(key, 0) - 1:
+                self.nonces[key] -= 1
+                while self.nonces[key] - 1 in gaps:
+                    self.nonces[key] -= 1
+                    gaps.discard(self.nonces[key])
+            else:
+                gaps.add(nonce)
+
+            if key in self.stale and not self.outstanding[key]:
+                await self._resync(client)
+
+    async def resync(self, client: Client) -> None:
+        key = self.key(client)
+        async with self.lock(client):
+            if self.outstanding.get(key):
+                self.stale.add(key)
+            else:
+                await self._resync(client)
+
+    async def _resync(self, client: Client) -> None:
+        key = self.key(client)
+        self.stale.discard(key)
+        pending = await self.pending_nonce(client)
+        gaps = self.gaps.setdefault(key, set())
+        if key not in self.nonces or pending >= self.nonces[key]:
+            self.nonces[key] = pending
+            gaps.clear()
+            return
+
+        gaps.difference_update(range(pending))
+
+
+nonce_manager = NonceManager()
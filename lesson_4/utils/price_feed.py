@@ -0,0 +1,102 @@
+import asyncio
+import json
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+import aiohttp
+
+from data.config import logger
+from utils.prices import price_service
+
+
+class PriceFeed:
+    url = 'wss://stream.binance.com:9443/stream'
+
+    def __init__(self, tokens: List[str], url: Optional[str] = None, reconnect_delay: float = 1) -> None:
+        self.tokens = [token.upper() for token in tokens]
+        self.url = url or self.url
+        self.reconnect_delay = reconnect_delay
+        self.tops: Dict[str, Tuple[float, float]] = {}
+        self.subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self.waiters: List[Tuple[str, Callable[[float], bool], asyncio.Future]] = []
+        self.task: Optional[asyncio.Task] = None
+        self.connected = asyncio.Event()
+
+    def start(self) -> 'PriceFeed':
+        if not self.task:
+            self.task = asyncio.ensure_future(self.run())
+        return self
+
+    async def stop(self) -> None:
+        if self.task:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+            self.task = None
+
+    async def run(self) -> None:
+        streams = '/'.join(f'{token.lower()}usdt@bookTicker' for token in self.tokens)
+        while True:
+            try:
+                async with aiohttp.ClientSession() as session:
+                    async with session.ws_connect(f'{self.url}?streams={streams}', heartbeat=30) as ws:
+                        self.connected.set()
+                        async for message in ws:
+                            if message.type == aiohttp.WSMsgType.TEXT:
+                                self.handle(json.loads(message.data))
+                            elif message.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                                break
+
+            except asyncio.CancelledError:
+                raise
+
+            except Exception as e:
+                logger.error(f'price feed: {e}')
+
+            self.connected.clear()
+            await asyncio.sleep(self.reconnect_delay)
+
+    def handle(self, message: dict) -> None:
+        ticker = message.get('data', message)
+        token = ticker['s'][:-len('USDT')]
+        bid, ask = float(ticker['b']), float(ticker['a'])
+        self.tops[token] = (bid, ask)
+        price_service.save(token, ask)
+
+        for queue in self.subscribers.get(token, set()):
+            queue.put_nowait((bid, ask))
+
+        for waiter in list(self.waiters):
+            waiter_token, condition, future = waiter
+            if future.done():
+                self.waiters.remove(waiter)
+            elif waiter_token == token and condition(ask):
+                future.set_result(ask)
+                self.waiters.remove(waiter)
+
+    def price(self, token: str) -> Optional[float]:
+        top = self.tops.get(token.upper())
+        return top[1] if top else None
+
+    async def subscribe(self, token: str) -> AsyncIterator[Tuple[float, float]]:
+        token = token.upper()
+        queue = asyncio.Queue()
+        self.subscribers.setdefault(token, set()).add(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self.subscribers[token].discard(queue)
+
+    async def wait_for(self, token: str, condition: Callable[[float], bool], timeout: Optional[float] = None) -> float:
+        token = token.upper()
+        price = self.price(token)
+        if price is not None and condition(price):
+            return price
+
+        future = asyncio.get_running_loop().create_future()
+        self.waiters.append((token, condition, future))
+        return await asyncio.wait_for(future, timeout=timeout)
+
+    async def when(self, token: str, condition: Callable[[float], bool], task: Callable[[], Awaitable],
+                   timeout: Optional[float] = None):
+        await self.wait_for(token=token, condition=condition, timeout=timeout)
+        return await task()
@@ -0,0 +1,103 @@
+"""lesson_3/utils/prices.py is a copy of this module; change both together."""
+import asyncio
+import json
+import time
+from typing import Dict, List, Optional, Tuple
+
+import aiohttp
+
+from data.config import logger
+
+
+class PriceError(Exception):
+    pass
+
+
+class PriceService:
+    url = 'https://api.binance.com/api/v3/ticker/bookTicker'
+    stablecoins = {'USDT': 1.}
+    invalid_symbol = -1121
+
+    def __init__(self, ttl: float = 10, retries: int = 5, backoff: float = 1) -> None:
+        self.ttl = ttl
+        self.retries = retries
+        self.backoff = backoff
+        self.quotes: Dict[str, Tuple[float, float]] = {}
+        self.in_flight: Dict[str, asyncio.Future] = {}
+        self.session: Optional[aiohttp.ClientSession] = None
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        if not self.session or self.session.closed:
+            self.session = aiohttp.ClientSession()
+        return self.session
+
+    def cached(self, token: str) -> Optional[float]:
+        if token in self.stablecoins:
+            return self.stablecoins[token]
+
+        quote = self.quotes.get(token)
+        if quote and time.monotonic() - quote[0] <= self.ttl:
+            return quote[1]
+        return None
+
+    def save(self, token: str, price: float) -> None:
+        self.quotes[token] = (time.monotonic(), price)
+
+    async def price(self, token: str = 'ETH') -> float:
+        return (await self.prices([token]))[token.upper()]
+
+    async def prices(self, tokens: List[str]) -> Dict[str, float]:
+        tokens = [token.upper() for token in tokens]
+        missing = [token for token in dict.fromkeys(tokens) if self.cached(token) is None]
+        to_fetch = [token for token in missing if token not in self.in_flight]
+        if to_fetch:
+            future = asyncio.ensure_future(self.fetch(to_fetch))
+            for token in to_fetch:
+                self.in_flight[token] = future
+            future.add_done_callback(lambda _: [self.in_flight.pop(token, None) for token in to_fetch])
+
+        waiters = {self.in_flight[token] for token in missing if token in self.in_flight}
+        if waiters:
+            await asyncio.gather(*[asyncio.shield(waiter) for waiter in waiters])
+
+        prices = {}
+        for token in tokens:
+            price = self.cached(token)
+            if price is None:
+                raise PriceError(f'can not get {token} price')
+            prices[token] = price
+        return prices
+
+    async def fetch(self, tokens: List[str]) -> None:
+        symbols = json.dumps([f'{token}USDT' for token in tokens], separators=(',', ':'))
+        for attempt in range(self.retries):
+            try:
+                logger.info(f'getting {", ".join(tokens)} price')
+                session = await self.get_session()
+                async with session.get(self.url, params={'symbols': symbols}) as r:
+                    if r.status == 400 and (await r.json(content_type=None)).get('code') == self.invalid_symbol:
+                        if len(tokens) == 1:
+                            logger.error(f'getting {tokens[0]} price: no {tokens[0]}USDT pair')
+                            return
+
+                        await asyncio.gather(*[self.fetch([token]) for token in tokens], return_exceptions=True)
+                        return
+
+                    if r.status != 200:
+                        raise PriceError(f'code: {r.status} | json: {await r.text()}')
+                    for ticker in await r.json():
+                        self.save(ticker['symbol'][:-len('USDT')], float(ticker['askPrice']))
+                return
+
+            except Exception as e:
+                logger.error(f'getting {", ".join(tokens)} price: {e}')
+                await asyncio.sleep(self.backoff * 2 ** attempt)
+
+        raise PriceError(f'can not get {", ".join(tokens)} price')
+
+    async def close(self) -> None:
+        if self.session:
+            await self.session.close()
+
+
+price_service = PriceService()
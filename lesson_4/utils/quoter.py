@@ -0,0 +1,77 @@
+import time
+from typing import Dict, List, Optional, Tuple
+
+from eth_abi import encode
+from py_eth_async.client import Client
+from py_eth_async.data.models import RawContract
+from web3 import Web3
+
+from data.models import Contracts
+from utils.amounts import min_amount
+from utils.multicall import Multicall
+
+
+class QuoteCache:
+    def __init__(self, block_ttl: float = 1) -> None:
+        self.block_ttl = block_ttl
+        self.blocks: Dict[int, Tuple[float, int]] = {}
+        self.quotes: Dict[int, Tuple[int, Dict[Tuple[str, str, int], Optional[int]]]] = {}
+
+    async def block_number(self, client: Client) -> int:
+        chain_id = client.network.chain_id
+        cached = self.blocks.get(chain_id)
+        if cached and time.monotonic() - cached[0] <= self.block_ttl:
+            return cached[1]
+
+        block = await client.w3.eth.block_number
+        self.blocks[chain_id] = (time.monotonic(), block)
+        return block
+
+    def at(self, chain_id: int, block: int) -> Dict[Tuple[str, str, int], Optional[int]]:
+        if chain_id not in self.quotes or self.quotes[chain_id][0] != block:
+            self.quotes[chain_id] = (block, {})
+        return self.quotes[chain_id][1]
+
+
+quote_cache = QuoteCache()
+
+
+class WooFiQuoter:
+    selector = Web3.keccak(text='querySwap(address,address,uint256)')[:4]
+
+    def __init__(self, client: Client, router: RawContract = Contracts.ARBITRUM_WOOFI) -> None:
+        self.client = client
+        self.router = Web3.to_checksum_address(router.address)
+        self.multicall = Multicall(client=client)
+
+    async def quotes_for(self, swaps: List[Tuple[str, str, int]],
+                         block: Optional[int] = None) -> Dict[Tuple[str, str, int], Optional[int]]:
+        swaps = [
+            (Web3.to_checksum_address(from_token), Web3.to_checksum_address(to_token), amount)
+            for from_token, to_token, amount in swaps
+        ]
+        if block is None:
+            block = await quote_cache.block_number(client=self.client)
+
+        cache = quote_cache.at(chain_id=self.client.network.chain_id, block=block)
+
+        missing = list(dict.fromkeys(swap for swap in swaps if swap not in cache))
+        if missing:
+            results = await self.multicall.aggregate(
+                [
+                    (self.router, self.selector + encode(['address', 'address', 'uint256'], list(swap)))
+                    for swap in missing
+                ],
+                block=block
+            )
+            for swap, data in zip(missing, results):
+                cache[swap] = self.multicall.decode_uint(data)
+
+        return {swap: cache[swap] for swap in swaps}
+
+    async def quote(self, from_token: str, to_token: str, amount: int) -> Optional[int]:
+        return list((await self.quotes_for([(from_token, to_token, amount)])).values())[0]
+
+    @staticmethod
+    def min_amount(to_amount: int, slippage: float) -> int:
+        return min_amount(amount=to_amount, slippage=slippage)
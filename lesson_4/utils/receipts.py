@@ -0,0 +1,178 @@
+import asyncio
+import statistics
+import time
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+import aiohttp
+from hexbytes import HexBytes
+from py_eth_async.client import Client
+
+from data.config import logger
+
+
+class ReceiptWatcher:
+    int_fields = ('blockNumber', 'status', 'gasUsed', 'effectiveGasPrice', 'cumulativeGasUsed', 'transactionIndex')
+
+    def __init__(self, poll_interval: float = 1, batch_size: int = 100, history: int = 10000,
+                 max_clients: int = 20) -> None:
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self.history = history
+        self.max_clients = max_clients
+        self.clients: Dict[int, Dict[Tuple[str, Optional[str]], Client]] = {}
+        self.active: Dict[int, Tuple[str, Optional[str]]] = {}
+        self.pending: Dict[int, Dict[str, Tuple[float, int, asyncio.Future]]] = {}
+        self.tasks: Dict[int, asyncio.Task] = {}
+        self.running: Set[int] = set()
+        self.inclusions: Dict[int, List[Tuple[float, int]]] = {}
+
+    @staticmethod
+    def normalize(tx_hash: Union[str, bytes]) -> str:
+        tx_hash = HexBytes(tx_hash).hex().lower()
+        return tx_hash if tx_hash.startswith('0x') else f'0x{tx_hash}'
+
+    @staticmethod
+    def client_key(client: Client) -> Tuple[str, Optional[str]]:
+        provider = client.w3.provider
+        return provider.endpoint_uri, dict(provider.get_request_kwargs()).get('proxy')
+
+    def add_client(self, client: Client) -> None:
+        chain_id = client.network.chain_id
+        clients = self.clients.setdefault(chain_id, {})
+        clients.setdefault(self.client_key(client), client)
+        for key in list(clients)[:max(len(clients) - self.max_clients, 0)]:
+            if key != self.active.get(chain_id):
+                del clients[key]
+
+    def client(self, chain_id: int) -> Client:
+        clients = self.clients[chain_id]
+        if self.active.get(chain_id) not in clients:
+            self.active[chain_id] = next(iter(clients))
+        return clients[self.active[chain_id]]
+
+    def rotate(self, chain_id: int) -> None:
+        keys = list(self.clients[chain_id])
+        if self.active.get(chain_id) in keys:
+            self.active[chain_id] = keys[(keys.index(self.active[chain_id]) + 1) % len(keys)]
+
+    @staticmethod
+    async def rpc(session: aiohttp.ClientSession, client: Client, requests: List[Tuple[str, list]]) -> list:
+        provider = client.w3.provider
+        payload = [
+            {'jsonrpc': '2.0', 'id': request_id, 'method': method, 'params': params}
+            for request_id, (method, params) in enumerate(requests)
+        ]
+        request_kwargs = dict(provider.get_request_kwargs())
+        async with session.post(provider.endpoint_uri, json=payload, **request_kwargs) as response:
+            responses = await response.json(content_type=None)
+
+        if isinstance(responses, dict):
+            raise Exception(f'receipt watcher: {responses.get("error", responses)}')
+        results = [None] * len(requests)
+        for response in responses:
+            results[response['id']] = response.get('result')
+        return results
+
+    def parse(self, receipt: dict) -> dict:
+        for field in self.int_fields:
+            if isinstance(receipt.get(field), str):
+                receipt[field] = int(receipt[field], 16)
+        return receipt
+
+    async def wait(self, client: Client, tx_hash: Union[str, bytes], timeout: float = 200) -> Optional[dict]:
+        chain_id = client.network.chain_id
+        tx_hash = self.normalize(tx_hash)
+        self.add_client(client)
+        pending = self.pending.setdefault(chain_id, {})
+        if tx_hash not in pending:
+            pending[tx_hash] = (time.monotonic(), -1, asyncio.get_running_loop().create_future())
+        future = pending[tx_hash][2]
+
+        if chain_id not in self.running or self.tasks[chain_id].done():
+            self.running.add(chain_id)
+            self.tasks[chain_id] = asyncio.ensure_future(self.watch(chain_id))
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.error(f'{client.network.name} | receipt watcher | {tx_hash} not mined in {timeout} s')
+            if tx_hash in pending and pending[tx_hash][2] is future:
+                del pending[tx_hash]
+            return None
+
+    async def watch(self, chain_id: int) -> None:
+        last_block = None
+        try:
+            async with aiohttp.ClientSession() as session:
+                while self.pending.get(chain_id):
+                    client = self.client(chain_id)
+                    try:
+                        block = int((await self.rpc(session, client, [('eth_blockNumber', [])]))[0], 16)
+                        if block != last_block:
+                            await self.poll(session, chain_id, block)
+                            last_block = block
+
+                    except asyncio.CancelledError:
+                        raise
+
+                    except Exception as e:
+                        logger.error(f'{client.network.name} | receipt watcher | {e}')
+                        self.rotate(chain_id)
+
+                    await asyncio.sleep(self.poll_interval)
+
+                # waiters registered while the session closes must start a new watcher
+                self.running.discard(chain_id)
+
+        finally:
+            if self.tasks.get(chain_id) is asyncio.current_task():
+                self.running.discard(chain_id)
+
+    async def poll(self, session: aiohttp.ClientSession, chain_id: int, block: int) -> None:
+        pending = self.pending[chain_id]
+        for tx_hash, (submitted_at, first_block, future) in list(pending.items()):
+            if first_block < 0:
+                pending[tx_hash] = (submitted_at, block, future)
+
+        tx_hashes = list(pending)
+        chunks = [tx_hashes[i:i + self.batch_size] for i in range(0, len(tx_hashes), self.batch_size)]
+        results = await asyncio.gather(*[
+            self.rpc(session, self.client(chain_id), [('eth_getTransactionReceipt', [tx_hash]) for tx_hash in chunk])
+            for chunk in chunks
+        ])
+
+        for chunk, receipts in zip(chunks, results):
+            for tx_hash, receipt in zip(chunk, receipts):
+                if not receipt or tx_hash not in pending:
+                    continue
+
+                submitted_at, first_block, future = pending.pop(tx_hash)
+                receipt = self.parse(receipt)
+                inclusion = time.monotonic() - submitted_at
+                inclusions = self.inclusions.setdefault(chain_id, [])
+                inclusions.append((inclusion, max(receipt['blockNumber'] - first_block, 0)))
+                del inclusions[:-self.history]
+                logger.debug(
+                    f'{self.client(chain_id).network.name} | receipt watcher | {tx_hash} mined in block '
+                    f'{receipt["blockNumber"]} after {inclusion:.1f} s'
+                )
+                if not future.done():
+                    future.set_result(receipt)
+
+    def stats(self, chain_id: int) -> Dict[str, float]:
+        inclusions = self.inclusions.get(chain_id)
+        if not inclusions:
+            return {}
+
+        seconds = sorted(inclusion for inclusion, blocks in inclusions)
+        return {
+            'count': len(seconds),
+            'pending': len(self.pending.get(chain_id, {})),
+            'p50': statistics.median(seconds),
+            'p95': seconds[min(len(seconds) - 1, int(len(seconds) * 0.95))],
+            'max': seconds[-1],
+            'blocks': statistics.mean(blocks for inclusion, blocks in inclusions),
+        }
+
+
+receipt_watcher = ReceiptWatcher()